@@ -0,0 +1,4 @@
+#!/usr/bin/env bash
+module=$1
+shift
+PYTHONPATH=src python3 -m "bench.$module" "$@"
@@ -1,3 +1,2 @@
 #!/usr/bin/env bash
-python3 src/main.py
-cd public && python3 -m http.server 8888
\ No newline at end of file
+python3 src/main.py serve
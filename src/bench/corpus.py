@@ -0,0 +1,109 @@
+import argparse
+import os
+import random
+
+WORDS = (
+    "static site generator markdown block inline parser template render page node tree "
+    "release change fix feature config option default value build output input cache"
+).split()
+
+LANGUAGES = ("python", "javascript", "bash", "")
+
+def sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def inline_text(rng, sentences=4):
+    parts = []
+    for _ in range(sentences):
+        text = sentence(rng)
+        match rng.randrange(6):
+            case 0:
+                text += f" It is **{rng.choice(WORDS)} {rng.choice(WORDS)}**."
+            case 1:
+                text += f" It is *{rng.choice(WORDS)}*."
+            case 2:
+                text += f" Use `{rng.choice(WORDS)}()` here."
+            case 3:
+                text += f" See [{rng.choice(WORDS)}](/{rng.choice(WORDS)}/{rng.randrange(1000)})."
+            case 4:
+                text += f" ![{rng.choice(WORDS)}](/images/{rng.choice(WORDS)}.png)"
+        parts.append(text)
+    return " ".join(parts)
+
+def code_block(rng, lines):
+    body = "\n".join(f"    {rng.choice(WORDS)}_{idx} = {rng.choice(WORDS)}({idx})" for idx in range(lines))
+    return f"```{rng.choice(LANGUAGES)}\n{body}\n```"
+
+def realistic_page(rng, title):
+    blocks = [f"# {title}"]
+    for _ in range(rng.randrange(5, 15)):
+        match rng.randrange(6):
+            case 0:
+                blocks.append(f"## {sentence(rng, 4)[:-1]}")
+            case 1:
+                blocks.append("\n".join(f"* {inline_text(rng, 1)}" for _ in range(rng.randrange(2, 6))))
+            case 2:
+                blocks.append("\n".join(f"{idx + 1}. {inline_text(rng, 1)}" for idx in range(rng.randrange(2, 6))))
+            case 3:
+                blocks.append("\n".join(f"> {sentence(rng)}" for _ in range(rng.randrange(1, 4))))
+            case 4:
+                blocks.append(code_block(rng, rng.randrange(3, 15)))
+            case _:
+                blocks.append(inline_text(rng, rng.randrange(2, 8)))
+    return "\n\n".join(blocks) + "\n"
+
+def long_paragraph_page(rng, title):
+    return f"# {title}\n\n" + "\n\n".join(inline_text(rng, 200) for _ in range(5)) + "\n"
+
+def many_links_page(rng, title, links=5000):
+    items = " ".join(f"[{rng.choice(WORDS)} {idx}](/changelog/{idx})" for idx in range(links))
+    return f"# {title}\n\n{items}\n"
+
+def huge_code_page(rng, title):
+    return f"# {title}\n\n" + code_block(rng, 20000) + "\n"
+
+PAGE_KINDS = {
+    "realistic": realistic_page,
+    "long_paragraphs": long_paragraph_page,
+    "many_links": many_links_page,
+    "huge_code": huge_code_page,
+}
+
+def generate_document(kind="realistic", seed=0, title="Generated page"):
+    return PAGE_KINDS[kind](random.Random(f"{kind}-{seed}"), title)
+
+def page_path(idx, depth, fanout=4):
+    parts = []
+    value = idx
+    for level in range(depth):
+        parts.append(f"section{value % fanout}")
+        value //= fanout
+    return os.path.join(*parts, f"page{idx}.md") if parts else f"page{idx}.md"
+
+def generate_corpus(root, pages=200, depth=3, seed=0, adversarial=True):
+    rng = random.Random(seed)
+    paths = []
+    for idx in range(pages):
+        kind = "realistic"
+        if adversarial and idx % 50 == 49:
+            kind = ("long_paragraphs", "many_links", "huge_code")[idx // 50 % 3]
+        path = os.path.join(root, page_path(idx, rng.randrange(depth + 1)))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(generate_document(kind, seed * pages + idx, f"Page {idx}"))
+        paths.append(path)
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic markdown corpus")
+    parser.add_argument("root")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-adversarial", action="store_true")
+    args = parser.parse_args(argv)
+    paths = generate_corpus(args.root, args.pages, args.depth, args.seed, not args.no_adversarial)
+    print(f"Wrote {len(paths)} pages to {args.root}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import os
+import tempfile
+import time
+
+from webgen.deps import DependencyGraph
+
+def build_graph(pages, assets, path):
+    graph = DependencyGraph(path)
+    graph.add("template.html", ["static/index.css"])
+    for idx in range(pages):
+        deps = ["template.html"]
+        if idx % 3 == 0:
+            deps.append(f"static/images/image{idx % assets}.png")
+        graph.add(f"public/section{idx % 100}/page{idx}.html", deps)
+    return graph
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def run(pages, assets, repeat):
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "deps.pickle")
+        graph = build_graph(pages, assets, path)
+        edges = sum(map(len, graph.edges.values()))
+        save, _ = best_time(graph.save, repeat)
+        load, graph = best_time(lambda: DependencyGraph(path), repeat)
+        print(f"{len(graph.edges)} nodes, {edges} edges, {os.path.getsize(path)} bytes on disk")
+        print(f"{'save':<32} {save * 1000:8.2f} ms")
+        print(f"{'load':<32} {load * 1000:8.2f} ms")
+        for name, changed in (("affected by one image", ["static/images/image0.png"]), ("affected by the stylesheet", ["static/index.css"])):
+            elapsed, causes = best_time(lambda: graph.affected(changed), repeat)
+            print(f"{name:<32} {elapsed * 1000:8.2f} ms {len(causes) - 1:8} nodes")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure persisting, loading and querying the page dependency graph")
+    parser.add_argument("--pages", type=int, default=75000)
+    parser.add_argument("--assets", type=int, default=500, help="distinct images referenced by every third page")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    run(args.pages, args.assets, args.repeat)
+
+if __name__ == "__main__":
+    main()
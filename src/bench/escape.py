@@ -0,0 +1,77 @@
+import argparse
+import html
+import time
+
+from bench.corpus import generate_document
+from data import htmlnode
+from data.highlevel import markdown_to_html_node
+from data.htmlnode import LeafNode, escape_text, render_attributes
+
+TEXT_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+def translate_escape(text):
+    return text.translate(TEXT_TABLE)
+
+def html_escape(text):
+    return html.escape(text, quote=False)
+
+def unescaped_props(props):
+    if not props:
+        return ""
+    return (" " + " ".join(map(lambda t: f'{t[0]}="{t[1]}"', props.items())) + " ").rstrip()
+
+def unescaped_time(trees, repeat):
+    # to_html as it was before escaping: text passed through and the old props f-string
+    saved = htmlnode.escape_text, htmlnode.render_attributes
+    htmlnode.escape_text, htmlnode.render_attributes = str, unescaped_props
+    try:
+        return best_time(lambda: [tree.to_html() for tree in trees], repeat)
+    finally:
+        htmlnode.escape_text, htmlnode.render_attributes = saved
+
+def leaves(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, LeafNode):
+            yield node
+        elif node.children is not None:
+            stack.extend(node.children)
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run(documents, repeat):
+    trees = [markdown_to_html_node(generate_document(kind, seed)) for kind in ("realistic", "many_links", "huge_code") for seed in range(documents)]
+    nodes = [leaf for tree in trees for leaf in leaves(tree)]
+    values = [leaf.value for leaf in nodes]
+    props = [leaf.props for leaf in nodes if leaf.props]
+    size = sum(map(len, values))
+
+    baseline = unescaped_time(trees, repeat)
+    to_html = best_time(lambda: [tree.to_html() for tree in trees], repeat)
+    print(f"{len(nodes)} leaves, {size} text bytes, {len(props)} props dicts")
+    print(f"{'ParentNode.to_html (unescaped)':<32} {baseline * 1000:8.2f} ms")
+    print(f"{'ParentNode.to_html (escaped)':<32} {to_html * 1000:8.2f} ms {to_html / baseline - 1:+7.1%} vs unescaped")
+    for name, func in (("escape_text", escape_text), ("str.translate table", translate_escape), ("html.escape", html_escape)):
+        elapsed = best_time(lambda: [func(value) for value in values], repeat)
+        print(f"{name:<32} {elapsed * 1000:8.2f} ms {elapsed / baseline:6.1%} of unescaped to_html")
+    for name, func in (("render_attributes", render_attributes), ("unescaped props f-string", unescaped_props)):
+        elapsed = best_time(lambda: [func(p) for p in props], repeat)
+        print(f"{name:<32} {elapsed * 1000:8.2f} ms {elapsed / baseline:6.1%} of unescaped to_html")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the share of HTML rendering spent escaping text and attributes")
+    parser.add_argument("--documents", type=int, default=20, help="documents generated per corpus kind")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    run(args.documents, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import sys
+import time
+
+from data.functions import split_nodes_images, split_nodes_links
+from data.highlevel import text_to_textnodes
+from data.textnode import TextNode, TextType
+
+def make_block(count):
+    return " ".join(
+        f"see [entry {idx}](/changelog/{idx}) and ![icon {idx}](/images/{idx}.png)"
+        for idx in range(count)
+    )
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def run(counts):
+    for count in counts:
+        block = make_block(count)
+        node = TextNode(block, TextType.TEXT)
+
+        elapsed_images, nodes = timed(split_nodes_images, [node])
+        elapsed_links, nodes = timed(split_nodes_links, nodes)
+        elapsed_inline, _ = timed(text_to_textnodes, block)
+
+        print(
+            f"{count:>7} links {len(block):>10} chars "
+            f"images {elapsed_images * 1000:8.2f} ms "
+            f"links {elapsed_links * 1000:8.2f} ms "
+            f"text_to_textnodes {elapsed_inline * 1000:8.2f} ms "
+            f"({len(nodes)} nodes, recursion limit {sys.getrecursionlimit()})"
+        )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress image/link splitting on link-heavy blocks")
+    parser.add_argument("counts", nargs="*", type=int, default=[1000, 10000, 50000])
+    run(parser.parse_args(argv).counts)
+
+if __name__ == "__main__":
+    main()
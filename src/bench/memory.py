@@ -0,0 +1,99 @@
+import argparse
+import gc
+import tracemalloc
+
+from data.highlevel import markdown_to_html_node, text_to_textnodes
+from data.htmlnode import LeafNode, ParentNode
+from data.textnode import TextNode
+
+SAMPLE = """# Release notes
+
+This release has **bold changes**, *subtle fixes* and a `config` flag, see [the docs](/docs/config) and ![diagram](/images/diagram.png).
+
+* First **item**
+* Second item with a [link](/second)
+
+1. Step one
+2. Step *two*
+
+> Quoted text
+> on two lines
+
+```
+print("hello")
+```
+"""
+
+class DictNode:
+    def __init__(self, tag, value, children, props):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+class DictTextNode:
+    def __init__(self, text, text_type, url):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+def to_dict_tree(node):
+    children = None
+    if node.children is not None:
+        children = [to_dict_tree(child) for child in node.children]
+    return DictNode(node.tag, node.value, children, node.props)
+
+def to_slotted_tree(node):
+    if node.children is None:
+        return LeafNode(node.tag, node.value, node.props)
+    return ParentNode(node.tag, [to_slotted_tree(child) for child in node.children], node.props)
+
+def to_dict_text_nodes(nodes):
+    return [DictTextNode(node.text, node.text_type, node.url) for node in nodes]
+
+def to_slotted_text_nodes(nodes):
+    return [TextNode(node.text, node.text_type, node.url) for node in nodes]
+
+def count_nodes(node):
+    count = 1
+    stack = list(node.children or [])
+    while stack:
+        child = stack.pop()
+        count += 1
+        if isinstance(child, ParentNode):
+            stack.extend(child.children)
+    return count
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    result = build()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return end - start, result
+
+def run(pages):
+    documents = [SAMPLE.replace("Release notes", f"Release notes {idx}") for idx in range(pages)]
+    paragraphs = [line for doc in documents for line in doc.splitlines() if line]
+
+    trees = [markdown_to_html_node(doc) for doc in documents]
+    node_count = sum(map(count_nodes, trees))
+    slotted, _ = measure(lambda: [to_slotted_tree(tree) for tree in trees])
+    with_dict, _ = measure(lambda: [to_dict_tree(tree) for tree in trees])
+
+    text_nodes = [text_to_textnodes(line) for line in paragraphs]
+    text_count = sum(map(len, text_nodes))
+    slotted_text, _ = measure(lambda: [to_slotted_text_nodes(nodes) for nodes in text_nodes])
+    with_dict_text, _ = measure(lambda: [to_dict_text_nodes(nodes) for nodes in text_nodes])
+
+    print(f"HTMLNode: {node_count} nodes, {with_dict / node_count:.1f} bytes/node with __dict__, {slotted / node_count:.1f} bytes/node with __slots__")
+    print(f"TextNode: {text_count} nodes, {with_dict_text / text_count:.1f} bytes/node with __dict__, {slotted_text / text_count:.1f} bytes/node with __slots__")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report memory used per HTMLNode/TextNode for a synthetic corpus")
+    parser.add_argument("--pages", type=int, default=2000)
+    run(parser.parse_args(argv).pages)
+
+if __name__ == "__main__":
+    main()
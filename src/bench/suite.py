@@ -0,0 +1,137 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from bench.corpus import generate_corpus, generate_document
+from data.blocks import block_to_block_type, markdown_to_blocks
+from data.highlevel import markdown_to_html_node, text_to_textnodes
+from webgen.gen import BuildContext, generate_pages_recursively
+
+TEMPLATE = "<html><head><title>{{ Title }}</title></head><body>{{ Content }}</body></html>"
+
+def best_time(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def result(name, elapsed, items, size):
+    return {
+        "name": name,
+        "seconds": elapsed,
+        "items": items,
+        "bytes": size,
+        "throughput": size / elapsed if elapsed > 0 else float("inf"),
+    }
+
+def bench_text_to_textnodes(repeat):
+    paragraphs = [
+        block for doc in ("realistic", "long_paragraphs")
+        for seed in range(20)
+        for block in markdown_to_blocks(generate_document(doc, seed))
+        if not block.startswith(("#", "```", "*", ">", "1."))
+    ]
+    size = sum(map(len, paragraphs))
+    elapsed = best_time(lambda: [text_to_textnodes(p) for p in paragraphs], repeat)
+    return result("text_to_textnodes", elapsed, len(paragraphs), size)
+
+def bench_block_to_block_type(repeat):
+    blocks = [block for seed in range(100) for block in markdown_to_blocks(generate_document("realistic", seed))]
+    size = sum(map(len, blocks))
+    elapsed = best_time(lambda: [block_to_block_type(b) for b in blocks], repeat)
+    return result("block_to_block_type", elapsed, len(blocks), size)
+
+def bench_markdown_to_html_node(repeat):
+    documents = [generate_document("realistic", seed) for seed in range(50)]
+    documents += [generate_document(kind) for kind in ("long_paragraphs", "many_links", "huge_code")]
+    size = sum(map(len, documents))
+    elapsed = best_time(lambda: [markdown_to_html_node(d) for d in documents], repeat)
+    return result("markdown_to_html_node", elapsed, len(documents), size)
+
+def bench_to_html(repeat):
+    trees = [markdown_to_html_node(generate_document("realistic", seed)) for seed in range(50)]
+    size = sum(len(tree.to_html()) for tree in trees)
+    elapsed = best_time(lambda: [tree.to_html() for tree in trees], repeat)
+    return result("ParentNode.to_html", elapsed, len(trees), size)
+
+def bench_generate_pages(repeat, pages=200, workers=1):
+    with tempfile.TemporaryDirectory() as root:
+        content = os.path.join(root, "content")
+        paths = generate_corpus(content, pages)
+        size = sum(os.path.getsize(path) for path in paths)
+        template = os.path.join(root, "template.html")
+        with open(template, "w") as f:
+            f.write(TEMPLATE)
+
+        runs = iter(range(repeat))
+        def build():
+            dest = os.path.join(root, f"public{next(runs)}")
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages_recursively(content, template, dest, BuildContext(workers=workers))
+
+        elapsed = best_time(build, repeat)
+    return result(f"generate_pages_recursively[workers={workers}]", elapsed, pages, size)
+
+MICRO_BENCHMARKS = (bench_text_to_textnodes, bench_block_to_block_type, bench_markdown_to_html_node, bench_to_html)
+
+def run(repeat, pages, workers):
+    results = [bench(repeat) for bench in MICRO_BENCHMARKS]
+    results.append(bench_generate_pages(repeat, pages, workers))
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+def compare(current, baseline, threshold):
+    previous = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    for res in current["results"]:
+        old = previous.get(res["name"])
+        if old is None:
+            continue
+        ratio = res["throughput"] / old["throughput"]
+        status = "REGRESSION" if ratio < 1 - threshold else "ok"
+        print(f"{res['name']:<45} {ratio:6.2f}x {status}")
+        if status != "ok":
+            regressions.append(res["name"])
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run micro and end-to-end benchmarks and emit JSON results")
+    parser.add_argument("-o", "--output", help="write results to this JSON file instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed throughput loss before failing (fraction)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("-j", "--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    current = run(args.repeat, args.pages, args.workers)
+    if args.output is None:
+        json.dump(current, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"Throughput regressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import argparse
+import sys
+
+from webgen.client import SOCKET_PATH, send_request
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Send build requests to a running 'main.py daemon'")
+    parser.add_argument("command", choices=["build", "rebuild", "ping", "shutdown"])
+    parser.add_argument("paths", nargs="*", help="changed source paths for the rebuild command")
+    parser.add_argument("--full", action="store_true", help="ignore the build manifest (build command)")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        response = send_request(args.socket, {"command": args.command, "paths": args.paths, "full": args.full})
+    except OSError as e:
+        print(f"Cannot reach build daemon on {args.socket}: {e}", file=sys.stderr)
+        return 2
+
+    sys.stdout.write(response.get("output", ""))
+    if not response["ok"]:
+        print(f"Build failed: {response['error']}", file=sys.stderr)
+        return 1
+    if "elapsed" in response:
+        print(f"Done in {response['elapsed'] * 1000:.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
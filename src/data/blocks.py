@@ -9,39 +9,78 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered list"
     UNORDERED_LIST = "unordered list"
 
+FENCE = "```"
+HEADING_REGEX = re.compile(r"#{1,6} ")
+
 def markdown_to_blocks(text):
-    blocks = text.split("\n\n")
-    return list(
-        filter(
-            lambda s: len(s) != 0,
-            map(lambda s: s.strip(), blocks)
-        ))
-
-def line_starts_with_prefix(pre):
-    def process(line):
-        return line.startswith(pre)
-    return process
-
-def line_starts_with_successive_numbers():
-    idx = 0
-    def process(line):
-        nonlocal idx
-        idx += 1
-        return line.startswith(f"{idx}. ")
-    return process
+    return ["\n".join(lines) for _, lines in scan_blocks(text.splitlines())]
 
-def block_to_block_type(block):
-    if re.search(r"^#{1,6} ", block) is not None:
+def classify_lines(lines):
+    if len(lines) == 0:
+        return BlockType.PARAGRAPH
+    if HEADING_REGEX.match(lines[0]) is not None:
         return BlockType.HEADING
-    if block.startswith("```") and block.endswith("```"):
+    if lines[0].startswith(FENCE) and lines[-1].endswith(FENCE):
         return BlockType.CODE
-    lines = block.splitlines()
-    if all(map(line_starts_with_prefix(">"), lines)):
+
+    quote = star = dash = ordered = True
+    for idx, line in enumerate(lines, 1):
+        quote = quote and line.startswith(">")
+        star = star and line.startswith("* ")
+        dash = dash and line.startswith("- ")
+        ordered = ordered and line.startswith(f"{idx}. ")
+        if not (quote or star or dash or ordered):
+            return BlockType.PARAGRAPH
+
+    if quote:
         return BlockType.QUOTE
-    if all(map(line_starts_with_prefix("* "), lines)) or all(map(line_starts_with_prefix("- "), lines)):
+    if star or dash:
         return BlockType.UNORDERED_LIST
-    if all(map(line_starts_with_successive_numbers(), lines)):
-        return BlockType.ORDERED_LIST
-    return BlockType.PARAGRAPH
+    return BlockType.ORDERED_LIST
+
+def block_to_block_type(block):
+    return classify_lines(block.splitlines())
+
+def close_block(lines):
+    lines[-1] = lines[-1].rstrip()
+    return classify_lines(lines), lines
+
+def scan_blocks(lines, fences=True):
+    lines = iter(lines)
+    block = []
+    fenced = False
+    for line in lines:
+        if fenced:
+            block.append(line)
+            if line.rstrip().endswith(FENCE):
+                yield close_block(block)
+                block = []
+                fenced = False
+            continue
+
+        if line == "" or line.isspace():
+            if block:
+                yield close_block(block)
+                block = []
+            continue
+
+        if not block:
+            line = line.lstrip()
+            if fences and line.startswith(FENCE) and not (len(line.rstrip()) >= 2 * len(FENCE) and line.rstrip().endswith(FENCE)):
+                fenced = True
+        block.append(line)
+
+    if not fenced:
+        if block:
+            yield close_block(block)
+        return
 
-    
+    # an unclosed fence means no later fence can close either
+    rest = iter(block)
+    head = []
+    for line in rest:
+        if line == "" or line.isspace():
+            break
+        head.append(line)
+    yield close_block(head)
+    yield from scan_blocks(rest, fences=False)
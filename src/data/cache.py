@@ -0,0 +1,79 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+from data.highlight import HIGHLIGHTER_VERSION
+from persist import load_versioned, save_versioned
+
+CACHE_VERSION = 5
+
+def block_key(block, salt=""):
+    # code blocks embed highlighter output, so a highlighter change must miss
+    return hashlib.sha1(f"{HIGHLIGHTER_VERSION}:{salt}{block}".encode()).digest()
+
+class BlockCache:
+    def __init__(self, maxsize=4096, path=None, name="Block cache"):
+        self.maxsize = maxsize
+        self.path = path
+        self.name = name
+        self.salt = ""
+        self.entries = OrderedDict()
+        self.added = {}
+        # only process-pool workers ship their misses back, everywhere else entries stay bounded by maxsize
+        self.record_added = False
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def render(self, block, process, scope=""):
+        return self.lookup(block_key(block, self.salt + scope), lambda: process(block).to_html())
+
+    def lookup(self, key, create):
+        html = self.entries.get(key)
+        if html is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return html
+
+        self.misses += 1
+        html = create()
+        self.put(key, html)
+        if self.record_added:
+            self.added[key] = html
+        return html
+
+    def put(self, key, html):
+        self.entries[key] = html
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def delta(self):
+        delta = self.hits, self.misses, self.added
+        self.hits = 0
+        self.misses = 0
+        self.added = {}
+        return delta
+
+    def merge(self, delta):
+        hits, misses, added = delta
+        self.hits += hits
+        self.misses += misses
+        for key, html in added.items():
+            self.put(key, html)
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0
+        return f"{self.name}: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), {len(self.entries)} entries"
+
+    def load(self):
+        entries = load_versioned(self.path, CACHE_VERSION)
+        if entries is not None:
+            self.entries = OrderedDict(entries[-self.maxsize:])
+
+    def save(self):
+        if self.path is None:
+            return
+        save_versioned(self.path, CACHE_VERSION, list(self.entries.items()))
@@ -1,13 +1,8 @@
 from data.htmlnode import LeafNode
 from data.textnode import TextNode, TextType
 
-from functools import reduce
-from itertools import islice
-from operator import add
 import re
 
-from string import Template
-
 def strip_empty_node(nodes, ttype):
     if len(nodes) <= 1:
         return nodes
@@ -27,63 +22,130 @@ def split_node_delimiter(node, delimiter, text_type):
         raise ValueError("cannot split text node with the same text type")
 
     parts = node.text.split(delimiter)
-    types = [node.text_type, text_type]
-
-    ttype = None
-    def append_node(acc, txt):
-        nonlocal ttype
-        ttype = types.pop(0)
-        types.append(ttype)
-        acc.append(TextNode(txt, ttype))
-
-        return acc
+    types = (node.text_type, text_type)
+    result = [TextNode(txt, types[idx % 2]) for idx, txt in enumerate(parts)]
 
-    result = list(reduce(append_node, parts, []))
-    if ttype is not None and ttype == text_type:
+    if len(parts) % 2 == 0:
         illformed = result.pop()
         result[-1].text += delimiter + illformed.text
     return strip_empty_node(result, text_type)
 
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
-    return list(reduce(add, map(lambda n: split_node_delimiter(n, delimiter, text_type), old_nodes)))
+    return [new for node in old_nodes for new in split_node_delimiter(node, delimiter, text_type)]
+
+IMAGE_REGEX = re.compile(r"!\[(.*?)\]\((.*?)\)")
+LINK_REGEX = re.compile(r"(?<!!)\[(.*?)\]\((.*?)\)")
 
 def extract_markdown_images(text):
-    regex = r"!\[(.*?)\]\((.*?)\)"
-    return  re.findall(regex, text)
+    return IMAGE_REGEX.findall(text)
 
 def extract_markdown_links(text):
-    regex = r"(?<!!)\[(.*?)\]\((.*?)\)"
-    return  re.findall(regex, text)
-
-def make_split_nodes_link_node(extract_markdown, text_type, template_string):
-    template = Template(template_string)
-
-    def process(nodes, current=None):
-        if len(nodes) == 0:
-            return []
-        if current is None:
-            if nodes[0].text_type != TextType.TEXT:
-                return [nodes[0]] + process(nodes[1:])
-            current = extract_markdown(nodes[0].text), nodes[0].text
-        
-        md_items, remainder = current
-        if len(md_items) == 0:
-            if remainder != "":
-                head = [TextNode(remainder, TextType.TEXT)]
-            else:
-                head = []
-            return head + process(nodes[1:])
-
-        pattern = template.substitute(text=md_items[0][0], url=md_items[0][1])
-        head, tail = remainder.split(pattern, maxsplit=1)
-        if head != "":
-            head = [TextNode(head, TextType.TEXT)]
-        else:
-            head = []
-        head.append(TextNode(md_items[0][0], text_type, md_items[0][1]))
-        return head + process(nodes, (md_items[1:], tail))
+    return LINK_REGEX.findall(text)
+
+def make_split_nodes_link_node(regex, text_type):
+    def process(nodes):
+        result = []
+        for node in nodes:
+            if node.text_type != TextType.TEXT:
+                result.append(node)
+                continue
+
+            text = node.text
+            start = 0
+            for match in regex.finditer(text):
+                if match.start() > start:
+                    result.append(TextNode(text[start:match.start()], TextType.TEXT))
+                result.append(TextNode(match.group(1), text_type, match.group(2)))
+                start = match.end()
+            if start < len(text):
+                result.append(TextNode(text[start:], TextType.TEXT))
+        return result
     return process
 
-split_nodes_images = make_split_nodes_link_node(extract_markdown_images, TextType.IMAGE, "![$text]($url)")
-split_nodes_links = make_split_nodes_link_node(extract_markdown_links, TextType.LINK, "[$text]($url)")
+split_nodes_images = make_split_nodes_link_node(IMAGE_REGEX, TextType.IMAGE)
+split_nodes_links = make_split_nodes_link_node(LINK_REGEX, TextType.LINK)
+
+INLINE_SPECIAL = re.compile(r"[*`!\[]")
+
+def make_finder(text):
+    cache = {}
+    def find(sub, start):
+        pos = cache.get(sub)
+        if pos is None or pos != -1 and pos < start:
+            pos = text.find(sub, start)
+            cache[sub] = pos
+        return pos
+    return find
+
+def match_link(text, find, start):
+    close = find("](", start + 1)
+    if close == -1:
+        return None
+    end = find(")", close + 2)
+    if end == -1:
+        return None
+    newline = find("\n", start)
+    if newline != -1 and newline < end:
+        return None
+    return text[start + 1:close], text[close + 2:end], end + 1
+
+def split_nested(token):
+    # like the delimiter passes: bold is split again by "*" and "`", italic by "`"
+    if token.text_type == TextType.BOLD and ("*" in token.text or "`" in token.text):
+        return split_nodes_delimiter(split_node_delimiter(token, "*", TextType.ITALIC), "`", TextType.CODE)
+    if token.text_type == TextType.ITALIC and "`" in token.text:
+        return split_node_delimiter(token, "`", TextType.CODE)
+    return [token]
+
+def split_inline(text):
+    find = make_finder(text)
+    nodes = []
+    start = 0
+    pos = 0
+    while True:
+        special = INLINE_SPECIAL.search(text, pos)
+        if special is None:
+            break
+        pos = special.start()
+        token = None
+
+        match text[pos]:
+            case "*":
+                end = find("**", pos + 2) if text.startswith("**", pos) else -1
+                if end != -1:
+                    token, next_pos = TextNode(text[pos + 2:end], TextType.BOLD), end + 2
+                else:
+                    end = find("*", pos + 1)
+                    if end != -1:
+                        token, next_pos = TextNode(text[pos + 1:end], TextType.ITALIC), end + 1
+
+            case "`":
+                end = find("`", pos + 1)
+                if end != -1:
+                    token, next_pos = TextNode(text[pos + 1:end], TextType.CODE), end + 1
+
+            case "!":
+                link = match_link(text, find, pos + 1) if text.startswith("![", pos) else None
+                if link is not None:
+                    alt, url, next_pos = link
+                    token = TextNode(alt, TextType.IMAGE, url)
+
+            case "[":
+                link = match_link(text, find, pos) if pos == 0 or text[pos - 1] != "!" else None
+                if link is not None:
+                    anchor, url, next_pos = link
+                    token = TextNode(anchor, TextType.LINK, url)
+
+        if token is None:
+            pos += 1
+            continue
+
+        if start < pos:
+            nodes.append(TextNode(text[start:pos], TextType.TEXT))
+        nodes.extend(split_nested(token))
+        start = pos = next_pos
+
+    if start < len(text):
+        nodes.append(TextNode(text[start:], TextType.TEXT))
+    return nodes
@@ -1,17 +1,33 @@
-from data.textnode import TextNode, TextType
-from data.htmlnode import LeafNode, ParentNode
-from data.functions import split_nodes_delimiter, split_nodes_images, split_nodes_links
-from data.blocks import BlockType, block_to_block_type, markdown_to_blocks
+from urllib.parse import urljoin
+
+import instrument
+from data.textnode import TextType
+from data.htmlnode import LeafNode, ParentNode, RawNode
+from data.functions import split_inline
+from data.blocks import BlockType, block_to_block_type, scan_blocks
+from data.highlight import highlight
+
+class UrlRewriter:
+    # maps references in one page to fingerprinted asset urls
+    def __init__(self, asset_urls, base_url="/"):
+        self.asset_urls = asset_urls
+        self.base_url = base_url
+
+    def __call__(self, url):
+        # relative references resolve against the page, images/x.png in /blog/post.html is /blog/images/x.png
+        return self.asset_urls.get(urljoin(self.base_url, url), url)
+
+    @property
+    def scope(self):
+        return self.base_url.rsplit("/", maxsplit=1)[0] + "/"
 
 def text_to_textnodes(text):
-    node = TextNode(text, TextType.TEXT)
-    text_nodes = split_nodes_delimiter([node], "**", TextType.BOLD)
-    text_nodes = split_nodes_delimiter(text_nodes, "*", TextType.ITALIC)
-    text_nodes = split_nodes_delimiter(text_nodes, "`", TextType.CODE)
-    text_nodes = split_nodes_images(text_nodes)
-    return list(filter(lambda n: n.text.strip() != "", split_nodes_links(text_nodes)))
-
-def text_node_to_html_node(text_node):
+    with instrument.timer("inline"):
+        return list(filter(lambda n: n.text.strip() != "", split_inline(text)))
+
+def text_node_to_html_node(text_node, rewrite=None):
+    if rewrite is None:
+        rewrite = str
     match text_node.text_type:
         case TextType.TEXT:
             return LeafNode(None, text_node.text)
@@ -29,13 +45,13 @@ def text_node_to_html_node(text_node):
             if text_node.url is None:
                 raise ValueError("link needs a target url")
 
-            return LeafNode("a", text_node.text, {"href": text_node.url})
+            return LeafNode("a", text_node.text, {"href": rewrite(text_node.url)})
 
         case TextType.IMAGE:
             if text_node.url is None:
                 raise ValueError("image needs a source url")
 
-            props = {"src": text_node.url}
+            props = {"src": rewrite(text_node.url)}
             if text_node.text is not None:
                 props["alt"] = text_node.text
 
@@ -44,28 +60,42 @@ def text_node_to_html_node(text_node):
         case _:
             raise ValueError("invalid text type")
 
-def process_paragraph(block):
-    return ParentNode("p", list(map(text_node_to_html_node, text_to_textnodes(block) )))
+def process_paragraph(block, rewrite=None):
+    return ParentNode("p", [text_node_to_html_node(node, rewrite) for node in text_to_textnodes(block)])
 
 def process_heading(block):
     head, tail = block.split(" ", maxsplit=1)
     return ParentNode(f"h{len(head)}", [LeafNode(None, tail)])
 
-def process_code(block):
-    return ParentNode("pre", [LeafNode("code", block[3:-3])])
+def process_code(block, highlights=None):
+    code = block[3:-3]
+    info, newline, _ = code.partition("\n")
+    if not newline or not info.strip():
+        return ParentNode("pre", [LeafNode("code", code)])
+
+    language = info.split()[0]
+    code = code[len(info):]
+    props = {"class": f"language-{language}"}
+    html = highlight(language, code, highlights)
+    if html is None:
+        return ParentNode("pre", [LeafNode("code", code, props)])
+    return ParentNode("pre", [ParentNode("code", [RawNode(html)], props)])
+
+def process_quote_lines(lines):
+    text = "\n".join(map(lambda line: line[1:].strip(), lines))
+    return ParentNode("blockquote", [LeafNode(None, text)])
 
 def process_quote(block):
-    lines = "\n".join(map(lambda line: line[1:].strip(), block.splitlines()))
-    return ParentNode("blockquote", [LeafNode(None, lines)])
+    return process_quote_lines(block.splitlines())
+
+def process_list_lines(lines, rewrite=None):
+    return [
+        ParentNode("li", [text_node_to_html_node(node, rewrite) for node in text_to_textnodes(line.split(" ", maxsplit=1)[1])])
+        for line in lines
+    ]
 
 def process_list_data(block):
-    lines = block.splitlines()
-    return list(
-        map(
-            lambda line: ParentNode("li", list(map(text_node_to_html_node, text_to_textnodes(line.split(" ", maxsplit=1)[1])))),
-            lines
-        )
-    )
+    return process_list_lines(block.splitlines())
 
 def process_unordered_list(block):
     return ParentNode("ul", process_list_data(block))
@@ -73,23 +103,54 @@ def process_unordered_list(block):
 def process_ordered_list(block):
     return ParentNode("ol", process_list_data(block))
 
+LINK_BLOCKS = (BlockType.PARAGRAPH, BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST)
+
+def process_block_lines(block_type, lines, highlights=None, rewrite=None):
+    match block_type:
+        case BlockType.PARAGRAPH:
+            return process_paragraph("\n".join(lines), rewrite)
+
+        case BlockType.HEADING:
+            return process_heading("\n".join(lines))
+
+        case BlockType.CODE:
+            return process_code("\n".join(lines), highlights)
+
+        case BlockType.QUOTE:
+            return process_quote_lines(lines)
+
+        case BlockType.UNORDERED_LIST:
+            return ParentNode("ul", process_list_lines(lines, rewrite))
+
+        case BlockType.ORDERED_LIST:
+            return ParentNode("ol", process_list_lines(lines, rewrite))
+
+        case _:
+            raise Exception("unexpected block type")
+
 def process_block(block):
-    block_processors = {
-        BlockType.PARAGRAPH: process_paragraph,
-        BlockType.HEADING: process_heading,
-        BlockType.CODE: process_code,
-        BlockType.QUOTE: process_quote,
-        BlockType.UNORDERED_LIST: process_unordered_list,
-        BlockType.ORDERED_LIST: process_ordered_list,
-    }
-
-    try:
-        func = block_processors[block_to_block_type(block)]
-    except KeyError:
-        raise Exception("unexpected block type")
-    return func(block)
-
-def markdown_to_html_node(text):
-    blocks = markdown_to_blocks(text)
-    children = list(map(process_block, blocks))
-    return ParentNode("div", children)
\ No newline at end of file
+    return process_block_lines(block_to_block_type(block), block.splitlines())
+
+def render_block_html(block_type, lines, cache=None, highlights=None, rewrite=None):
+    if cache is None:
+        return process_block_lines(block_type, lines, highlights, rewrite).to_html()
+    # rewritten relative references differ per directory, so their blocks are cached per directory
+    scope = rewrite.scope if rewrite is not None and block_type in LINK_BLOCKS else ""
+    return cache.render("\n".join(lines), lambda _: process_block_lines(block_type, lines, highlights, rewrite), scope)
+
+def render_blocks(blocks, cache=None, highlights=None, rewrite=None):
+    for block_type, lines in blocks:
+        yield render_block_html(block_type, lines, cache, highlights, rewrite)
+
+def markdown_to_html_node(text, cache=None, summary=None, highlights=None, rewrite=None):
+    with instrument.timer("markdown_to_blocks"):
+        blocks = list(scan_blocks(text.splitlines()))
+    if summary is not None:
+        for block_type, lines in blocks:
+            summary.add(block_type, lines)
+    with instrument.timer("process_blocks"):
+        if cache is None:
+            children = [process_block_lines(block_type, lines, highlights, rewrite) for block_type, lines in blocks]
+        else:
+            children = [RawNode(render_block_html(block_type, lines, cache, highlights, rewrite)) for block_type, lines in blocks]
+    return ParentNode("div", children)
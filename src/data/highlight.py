@@ -0,0 +1,109 @@
+import hashlib
+import re
+
+import instrument
+from data.htmlnode import escape_text
+
+HIGHLIGHTER_VERSION = 2
+
+
+class RegexHighlighter:
+    def __init__(self, rules, flags=0):
+        self.kinds = [kind for kind, _ in rules]
+        self.regex = re.compile("|".join(f"({pattern})" for _, pattern in rules), flags)
+
+    def tokens(self, code):
+        start = 0
+        for match in self.regex.finditer(code):
+            if match.start() > start:
+                yield None, code[start:match.start()]
+            yield self.kinds[match.lastindex - 1], match.group()
+            start = match.end()
+        if start < len(code):
+            yield None, code[start:]
+
+def keywords(*words):
+    return r"\b(?:" + "|".join(words) + r")\b"
+
+NUMBER = r"\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b"
+C_COMMENT = r"//[^\n]*|/\*[\s\S]*?\*/"
+DOUBLE_QUOTED = r'"(?:\\.|[^"\\\n])*"'
+SINGLE_QUOTED = r"'(?:\\.|[^'\\\n])*'"
+
+LANGUAGES = {}
+
+def register(highlighter, *names):
+    for name in names:
+        LANGUAGES[name] = highlighter
+
+register(RegexHighlighter([
+    ("comment", r"#[^\n]*"),
+    ("string", r"(?<!\w)[rRbBuUfF]{0,2}(?:\"\"\"[\s\S]*?\"\"\"|'''[\s\S]*?'''|" + DOUBLE_QUOTED + "|" + SINGLE_QUOTED + ")"),
+    ("keyword", keywords(
+        "False", "None", "True", "and", "as", "assert", "async", "await", "break", "class", "continue", "def", "del",
+        "elif", "else", "except", "finally", "for", "from", "global", "if", "import", "in", "is", "lambda", "match",
+        "nonlocal", "not", "or", "pass", "raise", "return", "try", "while", "with", "yield",
+    )),
+    ("decorator", r"^[ \t]*@[\w.]+"),
+    ("number", NUMBER),
+], re.MULTILINE), "python", "py")
+
+register(RegexHighlighter([
+    ("comment", C_COMMENT),
+    ("string", DOUBLE_QUOTED + "|" + SINGLE_QUOTED + r"|`(?:\\.|[^`\\])*`"),
+    ("keyword", keywords(
+        "async", "await", "break", "case", "catch", "class", "const", "continue", "default", "delete", "do", "else",
+        "export", "extends", "false", "finally", "for", "function", "if", "import", "in", "instanceof", "let", "new",
+        "null", "of", "return", "switch", "this", "throw", "true", "try", "typeof", "undefined", "var", "while", "yield",
+    )),
+    ("number", NUMBER),
+]), "javascript", "js")
+
+register(RegexHighlighter([
+    ("string", r'"(?:\\.|[^"\\])*"'),
+    ("keyword", keywords("true", "false", "null")),
+    ("number", r"-?" + NUMBER),
+]), "json")
+
+register(RegexHighlighter([
+    ("comment", r"(?:^|(?<=\s))#[^\n]*"),
+    ("string", DOUBLE_QUOTED + "|" + SINGLE_QUOTED),
+    ("variable", r"\$(?:\{[^}\n]*\}|\w+|[@#?$!*-])"),
+    ("keyword", keywords(
+        "case", "do", "done", "elif", "else", "esac", "export", "fi", "for", "function", "if", "in", "local",
+        "return", "then", "until", "while",
+    )),
+], re.MULTILINE), "shell", "sh", "bash", "console")
+
+register(RegexHighlighter([
+    ("comment", r"/\*[\s\S]*?\*/"),
+    ("string", DOUBLE_QUOTED + "|" + SINGLE_QUOTED),
+    ("property", r"(?<![\w-])[\w-]+(?=\s*:[^:{]*[;}])"),
+    ("number", r"#[0-9a-fA-F]{3,8}\b|-?\b\d+(?:\.\d+)?(?:px|em|rem|%|vh|vw|s|ms|deg)?"),
+    ("keyword", r"@[\w-]+|!important"),
+]), "css")
+
+def render_tokens(tokens):
+    parts = []
+    for kind, text in tokens:
+        if kind is None:
+            parts.append(escape_text(text))
+        else:
+            parts.append(f'<span class="tok-{kind}">{escape_text(text)}</span>')
+    return "".join(parts)
+
+def highlight_key(language, code):
+    return language, hashlib.sha1(code.encode()).digest(), HIGHLIGHTER_VERSION
+
+def highlight(language, code, cache=None):
+    highlighter = LANGUAGES.get(language.lower())
+    if highlighter is None:
+        return None
+
+    def render():
+        with instrument.timer("highlight"):
+            return render_tokens(highlighter.tokens(code))
+
+    if cache is None:
+        return render()
+    return cache.lookup(highlight_key(language.lower(), code), render)
@@ -1,4 +1,23 @@
+def escape_text(text):
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+def escape_attribute(text):
+    if "&" in text or "<" in text or ">" in text or '"' in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    return text
+
+def render_attributes(props):
+    html = ""
+    if props:
+        for name, value in props.items():
+            html += f' {name}="{escape_attribute(value)}"'
+    return html
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -8,17 +27,15 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError
 
-    def props_to_html(self):
-        if self.props is None:
-            return ""
+    def iter_html(self):
+        yield self.to_html()
 
-        props_str = " ".join(
-            map(
-                lambda t: f'{t[0]}="{t[1]}"',
-                self.props.items()
-                )
-            )
-        return " " + props_str + " "
+    def write_html(self, f):
+        f.writelines(self.iter_html())
+
+    def props_to_html(self):
+        attributes = render_attributes(self.props)
+        return attributes + " " if attributes else ""
 
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
@@ -32,6 +49,8 @@ class HTMLNode:
         )
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
     
@@ -40,25 +59,49 @@ class LeafNode(HTMLNode):
             raise ValueError("VLeafNode needs a value")
 
         if self.tag is None:
-            return self.value
-
-        props = self.props_to_html().rstrip()
+            return escape_text(self.value)
 
-        return f"<{self.tag}{props}>{self.value}</{self.tag}>"
+        return f"<{self.tag}{render_attributes(self.props)}>{escape_text(self.value)}</{self.tag}>"
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
     
-    def to_html(self):
+    def check(self):
         if self.tag is None:
             raise ValueError("ParentNode needs a tag")
 
         if self.children is None or self.children == []:
             raise ValueError("ParentNode needs at least one child")
 
+    def to_html(self):
+        self.check()
+
         children = "".join(map(lambda nd: nd.to_html(), self.children))
 
-        props = self.props_to_html().rstrip()
+        return f"<{self.tag}{render_attributes(self.props)}>{children}</{self.tag}>"
 
-        return f"<{self.tag}{props}>{children}</{self.tag}>"
\ No newline at end of file
+    def iter_html(self):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                yield node
+            elif isinstance(node, ParentNode):
+                node.check()
+                yield f"<{node.tag}{render_attributes(node.props)}>"
+                stack.append(f"</{node.tag}>")
+                stack.extend(reversed(node.children))
+            else:
+                yield node.to_html()
+
+class RawNode(HTMLNode):
+    __slots__ = ()
+
+    def __init__(self, html):
+        super().__init__(None, html, None, None)
+
+    def to_html(self):
+        return self.value
@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+from time import perf_counter
+
+recorder = None
+
+class NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_TIMER = NullTimer()
+
+class Timer:
+    __slots__ = ("recorder", "name", "args", "start")
+
+    def __init__(self, recorder, name, args):
+        self.recorder = recorder
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.add(self.name, self.start, perf_counter() - self.start, self.args)
+        return False
+
+class Recorder:
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.stages = {}
+        self.counters = {}
+        self.pages = []
+        self.events = []
+
+    def add(self, name, start, elapsed, args):
+        stage = self.stages.setdefault(name, [0, 0.0])
+        stage[0] += 1
+        stage[1] += elapsed
+        if name == "page":
+            self.pages.append((elapsed, args.get("path")))
+        if self.trace:
+            self.events.append((name, start, elapsed, args, os.getpid(), threading.get_ident()))
+
+    def count(self, name, value):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def drain(self):
+        state = self.stages, self.counters, self.pages, self.events
+        self.stages = {}
+        self.counters = {}
+        self.pages = []
+        self.events = []
+        return state
+
+    def merge(self, state):
+        stages, counters, pages, events = state
+        for name, (calls, seconds) in stages.items():
+            stage = self.stages.setdefault(name, [0, 0.0])
+            stage[0] += calls
+            stage[1] += seconds
+        for name, value in counters.items():
+            self.count(name, value)
+        self.pages.extend(pages)
+        if self.trace:
+            self.events.extend(events)
+
+    def summary(self, top=10):
+        lines = ["Build profile (inclusive time per stage):"]
+        for name, (calls, seconds) in sorted(self.stages.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {name:<20} {seconds * 1000:10.1f} ms {calls:8} calls")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"  {name:<20} {value:10}")
+        if self.pages:
+            lines.append("Slowest pages:")
+            for seconds, path in sorted(self.pages, key=lambda page: -page[0])[:top]:
+                lines.append(f"  {seconds * 1000:10.1f} ms {path}")
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        events = [
+            {
+                "name": name,
+                "cat": "build",
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": elapsed * 1e6,
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            }
+            for name, start, elapsed, args, pid, tid in sorted(self.events, key=lambda event: event[1])
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+def enable(trace=False):
+    global recorder
+    recorder = Recorder(trace)
+    return recorder
+
+def disable():
+    global recorder
+    recorder = None
+
+def enabled():
+    return recorder is not None
+
+def timer(name, **args):
+    if recorder is None:
+        return NULL_TIMER
+    return Timer(recorder, name, args)
+
+def count(name, value=1):
+    if recorder is not None:
+        recorder.count(name, value)
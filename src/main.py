@@ -1,10 +1,107 @@
-from webgen.fs import copy_files
-from webgen.gen import generate_pages_recursively
+import argparse
+import time
 
+import instrument
+import webgen.gen
+from webgen.build import Site, output_state_paths
+from webgen.client import SOCKET_PATH
+from webgen.daemon import BuildServer
+from webgen.fs import LINK_MODES
+from webgen.serve import BuildCounter, start_server
+from webgen.shard import parse_shard
+from webgen.watch import watch
 
-def main():
-    copy_files("static", "public")
-    generate_pages_recursively("content", "template.html", "public")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the static site from content/ and static/ into public/")
+    parser.add_argument("command", nargs="?", default="build", choices=["build", "watch", "serve", "daemon", "merge"],
+                        help="build once, rebuild on changes (watch), rebuild on changes and serve public/ (serve), "
+                             "keep running and rebuild on client.py requests (daemon), "
+                             "or combine the outputs of sharded builds (merge)")
+    parser.add_argument("shard_dirs", nargs="*", metavar="SHARD_DIR", help="shard output directories for the merge command")
+    parser.add_argument("-o", "--output", default="public", help="directory the site is generated into")
+    parser.add_argument("--shard", type=parse_shard, metavar="INDEX/COUNT|@FILE",
+                        help="build only one size-balanced shard of content/, or the content files listed in FILE")
+    parser.add_argument("--full", action="store_true", help="ignore the build manifest and rebuild everything")
+    parser.add_argument("--explain", action="store_true", help="print why each page is regenerated")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="number of page generation processes (0 for one per CPU)")
+    parser.add_argument("--cache-size", type=int, default=4096, help="number of rendered markdown blocks kept in the block cache")
+    parser.add_argument("--checksum", action="store_true", help="compare static files by content hash instead of size and mtime")
+    parser.add_argument("--link", choices=LINK_MODES, default="copy", help="how static files are placed in public/")
+    parser.add_argument("--fingerprint", action="store_true", help="copy static assets under content-hashed names and rewrite references")
+    parser.add_argument("--site-index", action="store_true", help="write sitemap.xml, feed.xml and sections.html from a persisted page index")
+    parser.add_argument("--base-url", default="", help="absolute site URL used in the sitemap and feed")
+    parser.add_argument("--search", action="store_true", help="write a sharded full-text search index under public/search/")
+    parser.add_argument("--check-links", action="store_true", help="check internal links and images against the generated site and write link-report.json under .build/")
+    parser.add_argument("--gzip", action="store_true", help="write precompressed .gz siblings for text outputs")
+    parser.add_argument("--stream-threshold", type=int, default=webgen.gen.STREAM_THRESHOLD,
+                        help="markdown files at least this many bytes are parsed and written block by block")
+    parser.add_argument("--profile", action="store_true", help="print time spent per build stage and the slowest pages")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace-event file of the build (implies --profile)")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="unix socket used by the daemon command")
+    parser.add_argument("-p", "--port", type=int, default=8888, help="port used by the serve command")
+    args = parser.parse_args(argv)
+    if args.shard is not None and args.command != "build":
+        parser.error("--shard only works with the build command")
+    if (args.command == "merge") != bool(args.shard_dirs):
+        parser.error("shard directories are given to the merge command only")
+    return args
+
+def make_rebuild(site, counter=None):
+    def rebuild(paths):
+        start = time.perf_counter()
+        try:
+            site.rebuild(paths)
+        except Exception as e:
+            print(f"Rebuild failed: {e}")
+            return
+        if counter is not None:
+            counter.bump()
+        print(f"Rebuilt {len(paths)} changed path(s) in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return rebuild
+
+def main(argv=None):
+    args = parse_args(argv)
+    webgen.gen.STREAM_THRESHOLD = args.stream_threshold
+    if args.profile or args.trace:
+        instrument.enable(trace=args.trace is not None)
+
+    site = Site(
+        public=args.output, shard=args.shard, workers=args.workers or None, cache_size=args.cache_size,
+        checksum=args.checksum, link=args.link, compress=args.gzip, fingerprint=args.fingerprint,
+        site_index=args.site_index, base_url=args.base_url, search=args.search, explain=args.explain,
+        check_links=args.check_links, **output_state_paths(args.output),
+    )
+    if args.command == "merge":
+        site.merge(args.shard_dirs)
+    else:
+        site.build(full=args.full)
+    if instrument.enabled():
+        print(instrument.recorder.summary())
+        if args.trace:
+            instrument.recorder.write_trace(args.trace)
+    if args.command in ("build", "merge"):
+        return
+
+    if args.command == "daemon":
+        with BuildServer(args.socket, site) as server:
+            print(f"Build daemon listening on {args.socket}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return
+
+    counter = None
+    if args.command == "serve":
+        counter = BuildCounter()
+        start_server(site.public, args.port, counter)
+        print(f"Serving {site.public} on http://localhost:{args.port}")
+
+    print(f"Watching {site.content}, {site.static} and {site.template}")
+    try:
+        watch([site.content, site.static, site.template], make_rebuild(site, counter))
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
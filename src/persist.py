@@ -0,0 +1,42 @@
+import json
+import os
+import pickle
+from contextlib import contextmanager
+
+@contextmanager
+def atomic_write(path, mode="w"):
+    base_dir = os.path.dirname(path)
+    if base_dir != "":
+        os.makedirs(base_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+def load_json(path, default=None):
+    # a missing or truncated state file only costs a rebuild
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path, data, **kwargs):
+    with atomic_write(path) as f:
+        json.dump(data, f, **kwargs)
+
+def load_versioned(path, version):
+    try:
+        with open(path, "rb") as f:
+            saved, data = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        return None
+    return data if saved == version else None
+
+def save_versioned(path, version, data):
+    with atomic_write(path, "wb") as f:
+        pickle.dump((version, data), f, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,36 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from bench.corpus import PAGE_KINDS, generate_corpus, generate_document
+from bench.suite import compare
+from data.highlevel import markdown_to_html_node
+
+class TestCorpus(unittest.TestCase):
+    def test_deterministic(self):
+        for kind in PAGE_KINDS:
+            self.assertEqual(generate_document(kind, 3), generate_document(kind, 3))
+        self.assertNotEqual(generate_document("realistic", 1), generate_document("realistic", 2))
+
+    def test_documents_render(self):
+        for kind in PAGE_KINDS:
+            self.assertTrue(markdown_to_html_node(generate_document(kind)).to_html().startswith("<div><h1>"))
+
+    def test_generate_corpus(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            paths = generate_corpus(first, pages=60, depth=3)
+            generate_corpus(second, pages=60, depth=3)
+            self.assertEqual(len(paths), 60)
+            for path in paths:
+                with open(path) as f, open(os.path.join(second, os.path.relpath(path, first))) as g:
+                    self.assertEqual(f.read(), g.read())
+
+class TestCompare(unittest.TestCase):
+    def test_compare(self):
+        baseline = {"results": [{"name": "a", "throughput": 100.0}, {"name": "b", "throughput": 100.0}]}
+        current = {"results": [{"name": "a", "throughput": 95.0}, {"name": "b", "throughput": 80.0}, {"name": "c", "throughput": 1.0}]}
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(compare(current, baseline, 0.1), ["b"])
+            self.assertEqual(compare(current, baseline, 0.25), [])
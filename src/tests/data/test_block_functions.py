@@ -1,6 +1,6 @@
 import unittest
 
-from data.blocks import markdown_to_blocks, block_to_block_type, BlockType
+from data.blocks import markdown_to_blocks, block_to_block_type, scan_blocks, BlockType
 
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_ok(self):
@@ -102,3 +102,59 @@ class TestBlockToBlockType(unittest.TestCase):
 
         for block in blocks:
             self.assertEqual(block_to_block_type(block), BlockType.PARAGRAPH)
+
+class TestScanBlocks(unittest.TestCase):
+    def test_ok(self):
+        text = """# This is a heading
+
+> I must say
+> I am very impressed!
+
+* First
+* Second
+
+1. One
+2. Two
+
+```
+def dummy_func():
+    print('dummy')
+```
+"""
+        self.assertEqual(list(scan_blocks(text.splitlines())), [
+            (BlockType.HEADING, ["# This is a heading"]),
+            (BlockType.QUOTE, ["> I must say", "> I am very impressed!"]),
+            (BlockType.UNORDERED_LIST, ["* First", "* Second"]),
+            (BlockType.ORDERED_LIST, ["1. One", "2. Two"]),
+            (BlockType.CODE, ["```", "def dummy_func():", "    print('dummy')", "```"]),
+        ])
+
+    def test_fenced_code_with_blank_lines(self):
+        text = "Intro\n\n```\nfirst()\n\n\n    second()\n```\n\nOutro"
+        self.assertEqual(markdown_to_blocks(text), [
+            "Intro",
+            "```\nfirst()\n\n\n    second()\n```",
+            "Outro",
+        ])
+        self.assertEqual(block_to_block_type(markdown_to_blocks(text)[1]), BlockType.CODE)
+
+    def test_unclosed_fence(self):
+        text = "```def dummy_func():\n    print('dummy')\n\n```still not closed\n\n* item"
+        self.assertEqual(list(scan_blocks(text.splitlines())), [
+            (BlockType.PARAGRAPH, ["```def dummy_func():", "    print('dummy')"]),
+            (BlockType.PARAGRAPH, ["```still not closed"]),
+            (BlockType.UNORDERED_LIST, ["* item"]),
+        ])
+
+    def test_single_line_fence(self):
+        self.assertEqual(list(scan_blocks(["```inline code```", "", "text"])), [
+            (BlockType.CODE, ["```inline code```"]),
+            (BlockType.PARAGRAPH, ["text"]),
+        ])
+
+    def test_whitespace_lines_separate_blocks(self):
+        self.assertEqual(markdown_to_blocks("  first  \n \t \n  second"), ["first", "second"])
+
+    def test_generator_input(self):
+        lines = (line for line in ["# Title", "", "text"])
+        self.assertEqual([block_type for block_type, _ in scan_blocks(lines)], [BlockType.HEADING, BlockType.PARAGRAPH])
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from data.cache import BlockCache, block_key
+from data.highlevel import markdown_to_html_node, process_block
+from data.htmlnode import RawNode
+
+class TestBlockCache(unittest.TestCase):
+    def test_render(self):
+        cache = BlockCache()
+        self.assertEqual(cache.render("Some **bold** text", process_block), "<p>Some <b>bold</b> text</p>")
+        self.assertEqual(cache.render("Some **bold** text", process_block), "<p>Some <b>bold</b> text</p>")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru(self):
+        cache = BlockCache(maxsize=2)
+        cache.render("# first", process_block)
+        cache.render("# second", process_block)
+        cache.render("# first", process_block)
+        cache.render("# third", process_block)
+        self.assertEqual(list(cache.entries), [block_key("# first"), block_key("# third")])
+
+    def test_markdown_to_html_node(self):
+        text = "# Title\n\nShared *footer*\n\nOther text\n\nShared *footer*"
+        cache = BlockCache()
+        node = markdown_to_html_node(text, cache)
+        self.assertIsInstance(node.children[0], RawNode)
+        self.assertEqual(node.to_html(), markdown_to_html_node(text).to_html())
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_delta_merge(self):
+        worker = BlockCache()
+        worker.record_added = True
+        worker.render("# first", process_block)
+        worker.render("# first", process_block)
+        delta = worker.delta()
+        self.assertEqual((worker.hits, worker.misses, worker.added), (0, 0, {}))
+
+        cache = BlockCache()
+        cache.merge(delta)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.entries[block_key("# first")], "<h1>first</h1>")
+
+    def test_added_only_recorded_in_workers(self):
+        cache = BlockCache(maxsize=2)
+        for idx in range(5):
+            cache.render(f"# block {idx}", process_block)
+        self.assertEqual((len(cache.entries), cache.added), (2, {}))
+
+    def test_key_depends_on_highlighter(self):
+        key = block_key("```python\npass\n```")
+        with mock.patch("data.cache.HIGHLIGHTER_VERSION", -1):
+            self.assertNotEqual(block_key("```python\npass\n```"), key)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "cache", "blocks.pickle")
+            cache = BlockCache(path=path)
+            cache.render("# first", process_block)
+            cache.save()
+
+            cache = BlockCache(path=path)
+            self.assertEqual(cache.render("# first", process_block), "<h1>first</h1>")
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+            with open(path, "wb") as f:
+                f.write(b"garbage")
+            self.assertEqual(len(BlockCache(path=path).entries), 0)
@@ -1,6 +1,6 @@
 import unittest
 
-from data.functions import split_nodes_delimiter, split_node_delimiter, strip_empty_node, extract_markdown_images, extract_markdown_links, split_nodes_images, split_nodes_links
+from data.functions import split_nodes_delimiter, split_node_delimiter, strip_empty_node, extract_markdown_images, extract_markdown_links, split_nodes_images, split_nodes_links, split_inline
 from data.textnode import TextNode, TextType
 
 class MixinTestTextNodes:
@@ -267,6 +267,14 @@ class TestExtractMarkdown(unittest.TestCase, MixinTestTextNodes):
             ("to google", TextType.LINK, "https://google.com"),
         ])
 
+    def test_split_nodes_many_links(self):
+        count = 20000
+        text = " ".join(f"[link {idx}](https://foobar.com/{idx}) ![image {idx}](https://foobar.com/{idx}.png)" for idx in range(count))
+        nodes = split_nodes_links(split_nodes_images([TextNode(text, TextType.TEXT)]))
+        self.assertEqual(len(nodes), count * 4 - 1)
+        self.assertEqual(nodes[0], TextNode("link 0", TextType.LINK, "https://foobar.com/0"))
+        self.assertEqual(nodes[-1], TextNode(f"image {count - 1}", TextType.IMAGE, f"https://foobar.com/{count - 1}.png"))
+
     def test_split_nodes_links_other_types(self):
         for ttype in [TextType.BOLD, TextType.CODE, TextType.ITALIC, TextType.IMAGE, TextType.LINK]:
             node = TextNode("This is text with a ![rick roll](https://i.imgur.com/aKaOqIh.gif) and ![obi wan](https://i.imgur.com/fJRm4Vk.jpeg)", ttype)
@@ -288,3 +296,62 @@ class TestExtractMarkdown(unittest.TestCase, MixinTestTextNodes):
             ("This is an unsupported italic text with embedded ![foobar](https://foobar.com/baz.jpeg) image", TextType.ITALIC),
         ])
 
+
+class TestSplitInline(unittest.TestCase, MixinTestTextNodes):
+    def split_multipass(self, text):
+        nodes = split_nodes_delimiter([TextNode(text, TextType.TEXT)], "**", TextType.BOLD)
+        nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+        nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+        nodes = split_nodes_links(split_nodes_images(nodes))
+        return list(filter(lambda n: n.text.strip() != "", nodes))
+
+    def test_ok(self):
+        text = "This is **text** with an *italic* word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
+        self.helper_test_node_list(split_inline(text), [
+            ("This is ", TextType.TEXT),
+            ("text", TextType.BOLD),
+            (" with an ", TextType.TEXT),
+            ("italic", TextType.ITALIC),
+            (" word and a ", TextType.TEXT),
+            ("code block", TextType.CODE),
+            (" and an ", TextType.TEXT),
+            ("obi wan image", TextType.IMAGE, "https://i.imgur.com/fJRm4Vk.jpeg"),
+            (" and a ", TextType.TEXT),
+            ("link", TextType.LINK, "https://boot.dev"),
+        ])
+
+    def test_illformed(self):
+        self.helper_test_node_list(split_inline("There is **Bold text** next to illformed *italic words"), [
+            ("There is ", TextType.TEXT),
+            ("Bold text", TextType.BOLD),
+            (" next to illformed *italic words", TextType.TEXT),
+        ])
+        self.helper_test_node_list(split_inline("not a [link] (here) nor `code"), [
+            ("not a [link] (here) nor `code", TextType.TEXT),
+        ])
+        self.helper_test_node_list(split_inline("[no\nlink](https://foobar.com)"), [
+            ("[no\nlink](https://foobar.com)", TextType.TEXT),
+        ])
+
+    def test_same_as_multipass(self):
+        texts = [
+            "plain text",
+            "**bold** at start and *italic* at end*",
+            "a **b** c *d* `e` ![f](g) [h](i) j",
+            "unclosed **bold and `code",
+            "![](https://foobar.com/empty.png) followed by [a link](https://foobar.com)",
+            "**a** **b** *c* *d* `e` `f`",
+            "a [b] (c) d [e](f)",
+            "**bold with *italic* inside**",
+            "**bold `code` and *it `x`* end** *italic `code`* tail",
+            "**unclosed *italic inside bold**",
+        ]
+        for text in texts:
+            nodes = list(filter(lambda n: n.text.strip() != "", split_inline(text)))
+            self.assertEqual(nodes, self.split_multipass(text), text)
+
+    def test_long_text(self):
+        text = "word **bold** *italic* `code` [link](https://foobar.com) " * 5000
+        nodes = split_inline(text)
+        self.assertEqual(len(nodes), 5000 * 8 + 1)
+        self.assertEqual(nodes[-2], TextNode("link", TextType.LINK, "https://foobar.com"))
@@ -182,6 +182,22 @@ def dummy_function():
         ])
         self.assertEqual(markdown_to_html_node(text), expected)
 
+    def test_code_with_blank_lines(self):
+        text = "# Title\n\n```\nfirst()\n\nsecond()\n```\n\n* item"
+        expected = ParentNode("div", [
+            ParentNode("h1", [LeafNode(None, "Title")]),
+            ParentNode("pre", [LeafNode("code", "\nfirst()\n\nsecond()\n")]),
+            ParentNode("ul", [ParentNode("li", [LeafNode(None, "item")])]),
+        ])
+        self.assertEqual(markdown_to_html_node(text), expected)
+
+    def test_escaped_output(self):
+        text = "# A <b> & c\n\n```\nif x < 1:\n```\n\n[a & b](/q?x=1&y=2)"
+        self.assertEqual(
+            markdown_to_html_node(text).to_html(),
+            '<div><h1>A &lt;b&gt; &amp; c</h1><pre><code>\nif x &lt; 1:\n</code></pre><p><a href="/q?x=1&amp;y=2">a &amp; b</a></p></div>',
+        )
+
     def test_illformed(self):
         text = "####### toto\n\n* blabla\n- blibli"
         expected = ParentNode("div", [
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import time
+import unittest
+
+from data import highlight
+from data.cache import BlockCache
+from data.highlevel import markdown_to_html_node, process_code
+from data.highlight import HIGHLIGHTER_VERSION, LANGUAGES, RegexHighlighter, highlight_key, register
+
+class TestHighlight(unittest.TestCase):
+    def test_python(self):
+        code = "@cached\ndef f(x):\n    # add one\n    return x + 1 if x else 'none'"
+        self.assertEqual(
+            highlight.highlight("python", code),
+            '<span class="tok-decorator">@cached</span>\n'
+            '<span class="tok-keyword">def</span> f(x):\n'
+            '    <span class="tok-comment"># add one</span>\n'
+            '    <span class="tok-keyword">return</span> x + <span class="tok-number">1</span> '
+            '<span class="tok-keyword">if</span> x <span class="tok-keyword">else</span> <span class="tok-string">\'none\'</span>',
+        )
+
+    def test_tokens_cover_code(self):
+        code = 'const a = `x ${b}` // note\nif (a < 3 && b) { return "</script>"; }'
+        tokens = list(LANGUAGES["js"].tokens(code))
+        self.assertEqual("".join(text for _, text in tokens), code)
+        self.assertIn(("comment", "// note"), tokens)
+        self.assertIn(("string", '"</script>"'), tokens)
+
+    def test_escapes(self):
+        html = highlight.highlight("sh", 'echo "<b>" && cat $HOME/a # done')
+        self.assertEqual(
+            html,
+            'echo <span class="tok-string">"&lt;b&gt;"</span> &amp;&amp; cat '
+            '<span class="tok-variable">$HOME</span>/a <span class="tok-comment"># done</span>',
+        )
+
+    def test_css_long_word(self):
+        word = "a" * 20000
+        start = time.perf_counter()
+        self.assertEqual(highlight.highlight("css", word), word)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(
+            highlight.highlight("css", "p { -webkit-x: 1; }"),
+            'p { <span class="tok-property">-webkit-x</span>: <span class="tok-number">1</span>; }',
+        )
+
+    def test_unknown_language(self):
+        self.assertIsNone(highlight.highlight("cobol", "DISPLAY 'HI'."))
+
+    def test_register(self):
+        register(RegexHighlighter([("keyword", r"\bSELECT\b")]), "sql")
+        self.addCleanup(LANGUAGES.pop, "sql")
+        self.assertEqual(highlight.highlight("SQL", "SELECT 1"), '<span class="tok-keyword">SELECT</span> 1')
+
+    def test_process_code(self):
+        self.assertEqual(
+            process_code("```python\nx = None\n```").to_html(),
+            '<pre><code class="language-python">\nx = <span class="tok-keyword">None</span>\n</code></pre>',
+        )
+        self.assertEqual(
+            process_code("```cobol linenos\nA < B\n```").to_html(),
+            '<pre><code class="language-cobol">\nA &lt; B\n</code></pre>',
+        )
+        self.assertEqual(process_code("```\nx = None\n```").to_html(), "<pre><code>\nx = None\n</code></pre>")
+        self.assertEqual(process_code("```x = None```").to_html(), "<pre><code>x = None</code></pre>")
+
+    def test_cache(self):
+        cache = BlockCache(name="Highlight cache")
+        text = "# Title\n\n```json\n{\"a\": true}\n```\n\nText\n\n```json\n{\"a\": true}\n```"
+        html = markdown_to_html_node(text, highlights=cache).to_html()
+        self.assertIn('<span class="tok-keyword">true</span>', html)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(list(cache.entries), [highlight_key("json", '\n{"a": true}\n')])
+        self.assertEqual(highlight_key("json", "1")[2], HIGHLIGHTER_VERSION)
+
+    def test_cache_persistence(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "highlight.pickle")
+            cache = BlockCache(path=path)
+            highlight.highlight("py", "pass", cache)
+            cache.save()
+
+            cache = BlockCache(path=path)
+            self.assertEqual(highlight.highlight("py", "pass", cache), '<span class="tok-keyword">pass</span>')
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
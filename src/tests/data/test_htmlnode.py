@@ -1,6 +1,6 @@
 import unittest
 
-from data.htmlnode import HTMLNode
+from data.htmlnode import HTMLNode, LeafNode, ParentNode
 
 class TestHTMLNode(unittest.TestCase):
     def test_repr(self):
@@ -25,3 +25,7 @@ class TestHTMLNode(unittest.TestCase):
 
         node = HTMLNode("span", "this is a text", None, None)
         self.assertEqual(node.props_to_html(), "")
+
+    def test_slots(self):
+        for node in (HTMLNode("p", "text"), LeafNode("b", "bold"), ParentNode("div", [LeafNode(None, "text")])):
+            self.assertFalse(hasattr(node, "__dict__"))
@@ -28,4 +28,13 @@ class TestLeafNode(unittest.TestCase):
 
         node = LeafNode("a", "this is a link", {"href": "http://foobar.com", "target": "_blank"})
         self.assertEqual(node.to_html(), '<a href="http://foobar.com" target="_blank">this is a link</a>')
-        
\ No newline at end of file
+        
+    def test_to_html_escapes(self):
+        node = LeafNode("code", "if a < b && c > d: print(\"x\")")
+        self.assertEqual(node.to_html(), '<code>if a &lt; b &amp;&amp; c &gt; d: print("x")</code>')
+
+        node = LeafNode(None, "<script>")
+        self.assertEqual(node.to_html(), "&lt;script&gt;")
+
+        node = LeafNode("a", "link", {"href": '/search?q="a"&b=<c>'})
+        self.assertEqual(node.to_html(), '<a href="/search?q=&quot;a&quot;&amp;b=&lt;c&gt;">link</a>')
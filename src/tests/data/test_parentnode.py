@@ -1,5 +1,6 @@
+import io
 import unittest
-from data.htmlnode import ParentNode, LeafNode
+from data.htmlnode import RawNode, ParentNode, LeafNode
 
 class TestParentNode(unittest.TestCase):
     def test_to_html(self):
@@ -53,3 +54,39 @@ class TestParentNode(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "ParentNode needs at least one child"):
             node = ParentNode("p", None)
             node.to_html()
+
+    def test_iter_html(self):
+        nodes = [
+            ParentNode("div", [LeafNode(None, "raw text"), LeafNode("strong", "this is a strong text")], {"class": "flex flex-row"}),
+            ParentNode("ul", [ParentNode("li", [LeafNode(None, "raw text"), LeafNode("strong", "this is a strong text", {"id": "strongTxt"})]),
+                              LeafNode("li", "this is a sample text"),
+                              ParentNode("li", [ParentNode("span", [LeafNode("i", "nested")])])
+                              ]),
+        ]
+        for node in nodes:
+            self.assertEqual("".join(node.iter_html()), node.to_html())
+
+        node = ParentNode("p", [LeafNode("b", "Bold text"), LeafNode(None, "Normal text")])
+        self.assertEqual(list(node.iter_html()), ["<p>", "<b>Bold text</b>", "Normal text", "</p>"])
+
+    def test_write_html(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode(None, "first")]), ParentNode("p", [LeafNode("b", "second")])])
+        out = io.StringIO()
+        node.write_html(out)
+        self.assertEqual(out.getvalue(), "<div><p>first</p><p><b>second</b></p></div>")
+
+        out = io.StringIO()
+        LeafNode("i", "leaf").write_html(out)
+        self.assertEqual(out.getvalue(), "<i>leaf</i>")
+
+    def test_iter_html_ko(self):
+        with self.assertRaisesRegex(ValueError, "ParentNode needs a tag"):
+            list(ParentNode("div", [ParentNode(None, [LeafNode(None, "foobar")])]).iter_html())
+
+        with self.assertRaisesRegex(ValueError, "ParentNode needs at least one child"):
+            list(ParentNode("div", [ParentNode("p", [])]).iter_html())
+
+    def test_raw_node_not_escaped(self):
+        node = ParentNode("div", [RawNode("<p>a &amp; b</p>"), LeafNode("p", "a & b")], {"title": "x > y"})
+        self.assertEqual(node.to_html(), '<div title="x &gt; y"><p>a &amp; b</p><p>a &amp; b</p></div>')
+        self.assertEqual("".join(node.iter_html()), node.to_html())
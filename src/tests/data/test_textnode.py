@@ -26,6 +26,12 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is not a text node", TextType.TEXT, "http://foobar.com")
         self.assertNotEqual(node, node2)
 
+    def test_slots(self):
+        node = TextNode("This is a text node", TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = "foobar"
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
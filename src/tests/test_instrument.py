@@ -0,0 +1,84 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import instrument
+from webgen.gen import BuildContext, generate_pages_recursively
+
+class TestInstrument(unittest.TestCase):
+    def tearDown(self):
+        instrument.disable()
+
+    def test_disabled(self):
+        self.assertFalse(instrument.enabled())
+        self.assertIs(instrument.timer("page", path="foo"), instrument.NULL_TIMER)
+        with instrument.timer("page"):
+            instrument.count("bytes_written", 10)
+
+    def test_recorder(self):
+        recorder = instrument.enable()
+        for path in ("a.md", "b.md"):
+            with instrument.timer("page", path=path):
+                with instrument.timer("inline"):
+                    pass
+        instrument.count("bytes_written", 10)
+        instrument.count("bytes_written", 5)
+
+        self.assertEqual(recorder.stages["page"][0], 2)
+        self.assertEqual(recorder.stages["inline"][0], 2)
+        self.assertEqual(recorder.counters, {"bytes_written": 15})
+        self.assertEqual(sorted(path for _, path in recorder.pages), ["a.md", "b.md"])
+        self.assertEqual(recorder.events, [])
+        self.assertIn("Slowest pages:", recorder.summary())
+
+    def test_drain_merge(self):
+        worker = instrument.Recorder(trace=True)
+        worker.add("page", 1.0, 0.5, {"path": "a.md"})
+        worker.count("bytes_written", 3)
+        state = worker.drain()
+        self.assertEqual(worker.stages, {})
+
+        recorder = instrument.Recorder(trace=True)
+        recorder.add("page", 2.0, 0.25, {"path": "b.md"})
+        recorder.merge(state)
+        self.assertEqual(recorder.stages["page"], [2, 0.75])
+        self.assertEqual(recorder.counters, {"bytes_written": 3})
+        self.assertEqual(len(recorder.events), 2)
+
+class TestInstrumentedBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        os.makedirs(self.content)
+        with open(self.template, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        for idx in range(4):
+            with open(os.path.join(self.content, f"page{idx}.md"), "w") as f:
+                f.write(f"# Page {idx}\n\nSome **bold** text")
+
+    def tearDown(self):
+        instrument.disable()
+        self.tmp.cleanup()
+
+    def test_build(self):
+        for workers in (1, 2):
+            recorder = instrument.enable(trace=True)
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_pages_recursively(self.content, self.template, os.path.join(self.root, f"public{workers}"), BuildContext(workers=workers))
+
+            self.assertEqual(recorder.stages["page"][0], 4)
+            self.assertEqual(recorder.stages["inline"][0], 4)
+            self.assertEqual(len(recorder.pages), 4)
+            self.assertGreater(recorder.counters["bytes_written"], 0)
+
+            trace_path = os.path.join(self.root, "trace.json")
+            recorder.write_trace(trace_path)
+            with open(trace_path) as f:
+                events = json.load(f)["traceEvents"]
+            self.assertEqual(sum(1 for event in events if event["name"] == "page"), 4)
+            self.assertTrue(all(event["ph"] == "X" for event in events))
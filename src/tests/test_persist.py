@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from persist import atomic_write, load_json, load_versioned, save_json, save_versioned
+
+class TestPersist(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "build", "state.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        self.assertEqual(load_json(self.path, {}), {})
+        save_json(self.path, {"a": [1, 2]})
+        self.assertEqual(load_json(self.path), {"a": [1, 2]})
+
+    def test_interrupted_write_keeps_old_file(self):
+        save_json(self.path, {"a": 1})
+        with self.assertRaises(KeyboardInterrupt):
+            with atomic_write(self.path) as f:
+                f.write('{"a": ')
+                raise KeyboardInterrupt
+        self.assertEqual(load_json(self.path), {"a": 1})
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["state.json"])
+
+    def test_corrupt_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write('{"a": ')
+        self.assertEqual(load_json(self.path, {}), {})
+
+    def test_versioned_round_trip(self):
+        path = os.path.join(self.tmp.name, "build", "state.pickle")
+        self.assertIsNone(load_versioned(path, 1))
+        save_versioned(path, 1, {"a": [1, 2]})
+        self.assertEqual(load_versioned(path, 1), {"a": [1, 2]})
+        self.assertIsNone(load_versioned(path, 2))
+        with open(path, "r+b") as f:
+            f.truncate(5)
+        self.assertIsNone(load_versioned(path, 1))
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["state.pickle"])
@@ -0,0 +1,19 @@
+import inspect
+import os
+
+from webgen.build import Site
+
+SITE_DIRS = ("content", "static", "template", "public")
+
+def write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+def make_site(root, **kwargs):
+    # roots the site directories and every .build/ state file in root, keeping the default file names
+    for name, param in inspect.signature(Site).parameters.items():
+        if name in SITE_DIRS:
+            kwargs.setdefault(name, os.path.join(root, param.default))
+        elif isinstance(param.default, str) and param.default.startswith(".build/"):
+            kwargs.setdefault(name, os.path.join(root, os.path.basename(param.default)))
+    return Site(**kwargs)
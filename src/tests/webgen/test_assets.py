@@ -0,0 +1,132 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from tests.webgen.helpers import make_site, write
+from webgen.assets import AssetMap, fingerprint_name
+from webgen.gen import asset_dependencies
+from webgen.manifest import file_hash
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.public = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        os.makedirs(self.content)
+        os.makedirs(os.path.join(self.static, "images"))
+        write(self.template, '<link href="/index.css" rel="stylesheet"><a href="https://example.com/">{{ Title }}</a>{{ Content }}')
+        write(os.path.join(self.content, "index.md"), "# Home\n\n![logo](/images/logo.png) [style](/index.css) [about](/about)")
+        write(os.path.join(self.static, "index.css"), "body {}")
+        write(os.path.join(self.static, "images", "logo.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, *parts):
+        with open(os.path.join(self.public, *parts)) as f:
+            return f.read()
+
+    def site(self, **kwargs):
+        return make_site(self.root, fingerprint=True, **kwargs)
+
+    def fingerprinted(self, rel_path):
+        return fingerprint_name(rel_path, file_hash(os.path.join(self.static, rel_path)))
+
+    def test_fingerprint_name(self):
+        self.assertEqual(fingerprint_name("images/logo.png", "0123456789abcdef"), "images/logo.0123456789.png")
+        self.assertEqual(fingerprint_name("LICENSE", "0123456789abcdef"), "LICENSE.0123456789")
+
+    def test_reuses_hash_for_unchanged_source(self):
+        path = os.path.join(self.root, "assets.json")
+        assets = AssetMap(path)
+        assets.fingerprint(os.path.join(self.static, "index.css"), "index.css")
+        os.makedirs(self.public)
+        assets.save(self.public)
+        reloaded = AssetMap(path)
+        reloaded.entries["index.css"]["hash"] = "f" * 64
+        self.assertEqual(reloaded.fingerprint(os.path.join(self.static, "index.css"), "index.css"), "index.ffffffffff.css")
+
+    def test_asset_dependencies(self):
+        assets = AssetMap(static=self.static)
+        assets.scan(self.static)
+        urls = ["/index.css", "/about", "/blog/post.html", "/images/logo.png", "https://example.com/"]
+        self.assertEqual(asset_dependencies(urls, assets), [os.path.join(self.static, "images", "logo.png"), os.path.join(self.static, "index.css")])
+
+    def test_build_rewrites_references(self):
+        self.site().build()
+        css = self.fingerprinted("index.css")
+        logo = self.fingerprinted(os.path.join("images", "logo.png"))
+        self.assertEqual(self.read(css), "body {}")
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.css")))
+        self.assertEqual(
+            self.read("index.html"),
+            f'<link href="/{css}" rel="stylesheet"><a href="https://example.com/">Home</a>'
+            f'<div><h1>Home</h1><p><img src="/{logo}" alt="logo"></img><a href="/{css}">style</a><a href="/about">about</a></p></div>',
+        )
+        with open(os.path.join(self.public, "asset-manifest.json")) as f:
+            self.assertEqual(json.load(f), {"/index.css": f"/{css}", "/images/logo.png": f"/{logo}"})
+
+    def test_relative_references_resolve_against_page(self):
+        os.makedirs(os.path.join(self.content, "blog"))
+        os.makedirs(os.path.join(self.static, "blog"))
+        write(os.path.join(self.static, "blog", "chart.png"), "chart")
+        write(os.path.join(self.content, "about.md"), "# About\n\n![logo](images/logo.png)")
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\n![logo](../images/logo.png) ![chart](chart.png)")
+        write(os.path.join(self.content, "blog", "other.md"), "# Other\n\n![logo](images/logo.png)")
+        site = self.site()
+        with contextlib.redirect_stdout(io.StringIO()):
+            site.build()
+        logo = self.fingerprinted(os.path.join("images", "logo.png"))
+        chart = self.fingerprinted(os.path.join("blog", "chart.png"))
+        self.assertIn(f'<img src="/{logo}" alt="logo">', self.read("about.html"))
+        self.assertIn(f'<img src="/{logo}" alt="logo"></img><img src="/{chart}" alt="chart">', self.read("blog", "post.html"))
+        self.assertIn('<img src="images/logo.png" alt="logo">', self.read("blog", "other.html"))
+
+        path = os.path.join(self.static, "blog", "chart.png")
+        write(path, "new chart")
+        with contextlib.redirect_stdout(io.StringIO()):
+            site.rebuild([path])
+        self.assertIn(f'<img src="/{self.fingerprinted(os.path.join("blog", "chart.png"))}" alt="chart">', self.read("blog", "post.html"))
+
+    def test_changed_asset_rebuilds_pages(self):
+        site = self.site(workers=2)
+        site.build()
+        old = self.fingerprinted("index.css")
+        path = os.path.join(self.static, "index.css")
+        write(path, "body { margin: 0; }")
+        site.rebuild([path])
+        new = self.fingerprinted("index.css")
+        self.assertNotEqual(new, old)
+        self.assertFalse(os.path.exists(os.path.join(self.public, old)))
+        html = self.read("index.html")
+        self.assertIn(f'<link href="/{new}"', html)
+        self.assertIn(f'<a href="/{new}">style</a>', html)
+
+    def test_changed_asset_rebuilds_referencing_pages_only(self):
+        write(os.path.join(self.content, "other.md"), "# Other\n\nNo images")
+        site = self.site(explain=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            site.build()
+        other = os.path.join(self.public, "other.html")
+        mtime = os.stat(other).st_mtime_ns
+        logo = os.path.join(self.static, "images", "logo.png")
+        write(logo, "new png")
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.site(explain=True).build()
+        self.assertIn(f"Rebuild {os.path.join(self.public, 'index.html')}: {logo} changed\n", out.getvalue())
+        self.assertNotIn("other.html:", out.getvalue())
+        self.assertEqual(os.stat(other).st_mtime_ns, mtime)
+        self.assertIn(f'<img src="/{self.fingerprinted(os.path.join("images", "logo.png"))}"', self.read("index.html"))
+
+        css = os.path.join(self.static, "index.css")
+        write(css, "body { margin: 0; }")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            site.rebuild([css])
+        self.assertIn(f"Rebuild {other}: {css} changed (via {self.template})\n", out.getvalue())
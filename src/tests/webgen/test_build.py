@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from tests.webgen.helpers import make_site, write
+
+class TestSite(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.site = make_site(self.root)
+        os.makedirs(os.path.join(self.site.content, "blog"))
+        os.makedirs(os.path.join(self.site.static, "images"))
+        write(self.site.template, "<title>{{ Title }}</title>{{ Content }}")
+        write(os.path.join(self.site.content, "index.md"), "# Home\n\nWelcome")
+        write(os.path.join(self.site.content, "blog", "post.md"), "# Post\n\nSome *text*")
+        write(os.path.join(self.site.static, "images", "logo.svg"), "<svg/>")
+        self.site.build()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, *parts):
+        with open(os.path.join(self.site.public, *parts)) as f:
+            return f.read()
+
+    def test_build(self):
+        self.assertEqual(self.read("index.html"), "<title>Home</title><div><h1>Home</h1><p>Welcome</p></div>")
+        self.assertEqual(self.read("images", "logo.svg"), "<svg/>")
+
+    def test_rebuild_page(self):
+        index = os.path.join(self.site.public, "index.html")
+        mtime = os.stat(index).st_mtime_ns
+        post = os.path.join(self.site.content, "blog", "post.md")
+        write(post, "# Post\n\nOther *text*")
+        self.site.rebuild([post])
+        self.assertEqual(self.read("blog", "post.html"), "<title>Post</title><div><h1>Post</h1><p>Other <i>text</i></p></div>")
+        self.assertEqual(os.stat(index).st_mtime_ns, mtime)
+
+    def test_rebuild_new_and_deleted(self):
+        page = os.path.join(self.site.content, "docs", "new.md")
+        os.makedirs(os.path.dirname(page))
+        write(page, "# New")
+        asset = os.path.join(self.site.static, "images", "logo.svg")
+        os.remove(asset)
+        self.site.rebuild([page, asset])
+        self.assertEqual(self.read("docs", "new.html"), "<title>New</title><div><h1>New</h1></div>")
+        self.assertFalse(os.path.exists(os.path.join(self.site.public, "images", "logo.svg")))
+
+    def test_rebuild_uses_highlight_cache(self):
+        post = os.path.join(self.site.content, "blog", "post.md")
+        write(post, "# Post\n\n```python\npass\n```")
+        self.site.rebuild([post])
+        self.assertIn('<span class="tok-keyword">pass</span>', self.read("blog", "post.html"))
+        self.assertEqual(list(self.site.highlights.entries.values()), ['\n<span class="tok-keyword">pass</span>\n'])
+
+    def test_full_build_after_build(self):
+        self.site.build(full=True)
+        self.assertEqual(self.read("blog", "post.html"), "<title>Post</title><div><h1>Post</h1><p>Some <i>text</i></p></div>")
+
+    def test_rebuild_removed_then_readded_dir(self):
+        post = os.path.join(self.site.content, "blog", "post.md")
+        os.remove(post)
+        self.site.rebuild([post])
+        self.assertFalse(os.path.exists(os.path.join(self.site.public, "blog")))
+        page = os.path.join(self.site.content, "blog", "new.md")
+        write(page, "# New")
+        self.site.rebuild([page])
+        self.assertEqual(self.read("blog", "new.html"), "<title>New</title><div><h1>New</h1></div>")
+
+    def test_rebuild_template(self):
+        write(self.site.template, "<h1>{{ Title }}</h1>")
+        self.site.rebuild([self.site.template])
+        self.assertEqual(self.read("index.html"), "<h1>Home</h1>")
+        self.assertEqual(self.read("blog", "post.html"), "<h1>Post</h1>")
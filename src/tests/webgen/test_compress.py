@@ -0,0 +1,70 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from tests.webgen.helpers import make_site, write
+from webgen.compress import Compressor
+
+class TestCompress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.public = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        os.makedirs(self.content)
+        os.makedirs(self.static)
+        write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        write(os.path.join(self.content, "index.md"), "# Home\n\n" + "Welcome home. " * 100)
+        write(os.path.join(self.static, "index.css"), "body { margin: 0; }\n" * 50)
+        write(os.path.join(self.static, "tiny.css"), "p {}")
+        write(os.path.join(self.static, "logo.png"), "png" * 200)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def public_path(self, name):
+        return os.path.join(self.public, name)
+
+    def site(self):
+        return make_site(self.root, compress=True)
+
+    def test_compress_file(self):
+        path = self.public_path("page.html")
+        os.makedirs(self.public)
+        write(path, "<p>hello</p>" * 100)
+        compressor = Compressor(workers=2)
+        compressor.submit(path)
+        stats = compressor.wait()
+        compressor.close()
+        self.assertEqual(stats.compressed, 1)
+        with open(path, "rb") as f, gzip.open(path + ".gz") as g:
+            self.assertEqual(g.read(), f.read())
+
+    def test_build_writes_gzip_siblings(self):
+        self.site().build()
+        for name in ("index.html", "index.css"):
+            with open(self.public_path(name), "rb") as f, gzip.open(self.public_path(name + ".gz")) as g:
+                self.assertEqual(g.read(), f.read())
+        self.assertFalse(os.path.exists(self.public_path("tiny.css.gz")))
+        self.assertFalse(os.path.exists(self.public_path("logo.png.gz")))
+
+    def test_unchanged_outputs_not_recompressed(self):
+        self.site().build()
+        before = os.stat(self.public_path("index.html.gz")).st_mtime_ns
+        site = self.site()
+        site.build()
+        self.assertEqual(os.stat(self.public_path("index.html.gz")).st_mtime_ns, before)
+
+        compressor = site.compressor
+        compressor.ensure(self.public_path("index.html"))
+        self.assertEqual(compressor.wait().unchanged, 1)
+
+    def test_stale_gzip_removed(self):
+        self.site().build()
+        os.remove(os.path.join(self.static, "index.css"))
+        self.site().build()
+        self.assertFalse(os.path.exists(self.public_path("index.css")))
+        self.assertFalse(os.path.exists(self.public_path("index.css.gz")))
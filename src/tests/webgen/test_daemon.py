@@ -0,0 +1,67 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from tests.webgen.helpers import make_site, write
+from webgen.client import send_request
+from webgen.daemon import BuildServer
+
+class TestBuildServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.site = make_site(self.root)
+        os.makedirs(self.site.content)
+        os.makedirs(self.site.static)
+        write(self.site.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.page = os.path.join(self.site.content, "index.md")
+        write(self.page, "# Home\n\nWelcome")
+
+        self.socket_path = os.path.join(self.root, "daemon.sock")
+        self.server = BuildServer(self.socket_path, self.site)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def request(self, **request):
+        return send_request(self.socket_path, request, timeout=10)
+
+    def test_ping(self):
+        self.assertEqual(self.request(command="ping"), {"ok": True})
+
+    def test_build_and_rebuild(self):
+        response = self.request(command="build")
+        self.assertTrue(response["ok"])
+        self.assertIn("Generate page from", response["output"])
+
+        write(self.page, "# Home\n\nChanged")
+        response = self.request(command="rebuild", paths=[self.page])
+        self.assertTrue(response["ok"])
+        with open(os.path.join(self.site.public, "index.html")) as f:
+            self.assertEqual(f.read(), "<title>Home</title><div><h1>Home</h1><p>Changed</p></div>")
+
+    def test_errors(self):
+        self.assertEqual(self.request(command="foo"), {"ok": False, "error": "unknown command 'foo'"})
+        write(self.page, "no title")
+        response = self.request(command="rebuild", paths=[self.page])
+        self.assertEqual(response, {"ok": False, "error": "no header found"})
+        self.assertTrue(self.request(command="ping")["ok"])
+
+    def test_concurrent_requests(self):
+        self.request(command="build")
+        results = []
+        def rebuild():
+            results.append(self.request(command="rebuild", paths=[self.page]))
+        threads = [threading.Thread(target=rebuild) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result["ok"] for result in results))
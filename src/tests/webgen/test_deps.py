@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from webgen.deps import DependencyGraph
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = DependencyGraph()
+        self.graph.add("template.html", ["static/site.css"])
+        self.graph.add("public/index.html", ["template.html", "static/logo.png"])
+        self.graph.add("public/post.html", ["./template.html"])
+
+    def test_affected(self):
+        self.assertEqual(self.graph.affected(["static/logo.png"]), {"static/logo.png": None, "public/index.html": "static/logo.png"})
+        causes = self.graph.affected(["static/site.css"])
+        self.assertEqual(set(causes), {"static/site.css", "template.html", "public/index.html", "public/post.html"})
+        self.assertEqual(self.graph.affected(["content/index.md"]), {"content/index.md": None})
+
+    def test_staleness(self):
+        causes = self.graph.affected(["./static/site.css"])
+        self.assertEqual(self.graph.staleness("public/post.html", causes), "static/site.css changed (via template.html)")
+        self.assertEqual(self.graph.staleness("public/index.html", self.graph.affected(["static/logo.png"])), "static/logo.png changed")
+        self.assertIsNone(self.graph.staleness("public/post.html", {}))
+        self.assertEqual(self.graph.staleness("public/new.html", {}), "no recorded dependencies")
+
+    def test_groups(self):
+        self.graph.add("public/about.html", ["template.html"])
+        self.assertEqual(self.graph.groups[("template.html",)], {"public/post.html", "public/about.html"})
+        self.graph.add("public/about.html", ["template.html", "static/logo.png"])
+        self.graph.remove("public/post.html")
+        self.assertNotIn(("template.html",), self.graph.groups)
+        self.assertEqual(self.graph.groups[("template.html", "static/logo.png")], {"public/index.html", "public/about.html"})
+
+    def test_prune(self):
+        self.graph.prune({"public/post.html"})
+        self.assertEqual(set(self.graph.edges), {"template.html", "public/post.html"})
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "build", "deps.pickle")
+            self.graph.path = path
+            self.graph.save()
+
+            graph = DependencyGraph(path)
+            self.assertEqual(graph.edges, self.graph.edges)
+            self.assertEqual(graph.groups, self.graph.groups)
+
+            with open(path, "wb") as f:
+                f.write(b"garbage")
+            self.assertEqual(DependencyGraph(path).edges, {})
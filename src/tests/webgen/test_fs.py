@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from tests.webgen.helpers import write
+from webgen.fs import copy_files
+from webgen.manifest import Manifest
+
+class TestCopyFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.static = os.path.join(self.root, "static")
+        self.public = os.path.join(self.root, "public")
+        os.makedirs(os.path.join(self.static, "images"))
+        write(os.path.join(self.static, "index.css"), "body {}")
+        write(os.path.join(self.static, "images", "logo.png"), "png" * 100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, *parts):
+        with open(os.path.join(self.public, *parts)) as f:
+            return f.read()
+
+    def sync(self, **kwargs):
+        manifest = Manifest(os.path.join(self.root, "manifest.json"))
+        stats = copy_files(self.static, self.public, manifest, **kwargs)
+        manifest.prune()
+        manifest.save()
+        return stats
+
+    def test_full_copy(self):
+        stats = copy_files(self.static, self.public)
+        self.assertEqual((stats.copied, stats.bytes_copied, stats.skipped), (2, 307, 0))
+        self.assertEqual(self.read("images", "logo.png"), "png" * 100)
+
+    def test_sync_unchanged(self):
+        self.sync()
+        stats = self.sync()
+        self.assertEqual((stats.copied, stats.skipped, stats.bytes_skipped), (0, 2, 307))
+
+    def test_sync_changed_and_removed(self):
+        self.sync()
+        write(os.path.join(self.static, "index.css"), "body { margin: 0; }")
+        os.remove(os.path.join(self.static, "images", "logo.png"))
+        stats = self.sync()
+        self.assertEqual((stats.copied, stats.bytes_copied, stats.skipped), (1, 19, 0))
+        self.assertEqual(self.read("index.css"), "body { margin: 0; }")
+        self.assertFalse(os.path.exists(os.path.join(self.public, "images", "logo.png")))
+
+    def test_sync_checksum(self):
+        self.sync()
+        dest = os.path.join(self.public, "index.css")
+        os.utime(dest, ns=(0, 0))
+        stats = self.sync(checksum=True)
+        self.assertEqual(stats.copied, 0)
+        stats = self.sync()
+        self.assertEqual(stats.copied, 1)
+
+    def test_hardlink(self):
+        self.sync(link="hardlink")
+        src = os.stat(os.path.join(self.static, "index.css"))
+        dest = os.stat(os.path.join(self.public, "index.css"))
+        self.assertEqual(src.st_ino, dest.st_ino)
+        self.assertEqual(self.sync(link="hardlink").skipped, 2)
+
+    def test_copy_replaces_hardlink(self):
+        self.sync(link="hardlink")
+        write(os.path.join(self.static, "new.css"), "new")
+        os.replace(os.path.join(self.static, "new.css"), os.path.join(self.static, "index.css"))
+        self.sync()
+        self.assertEqual(self.read("index.css"), "new")
+
+    def test_reflink(self):
+        self.sync(link="reflink")
+        self.assertEqual(self.read("images", "logo.png"), "png" * 100)
+        self.assertEqual(self.sync(link="reflink").skipped, 2)
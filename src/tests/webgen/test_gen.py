@@ -1,51 +1,152 @@
+import contextlib
+import io
+import os
+import tempfile
 import unittest
-from webgen.gen import extract_title
+from unittest import mock
+from data.cache import BlockCache
+from webgen.gen import BuildContext, collect_pages, generate_page, generate_pages_recursively, render_page, stream_large_page, stream_page, write_page
+from webgen.template import Template
+from webgen.writer import OutputWriter
 
-class TestGeneratorFunctions(unittest.TestCase):
-    def test_extract_title_ok(self):
-        text = "# Hello"
-        self.assertEqual(extract_title(text), "Hello")
+class TestGeneratePages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        with open(self.template, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+        for idx in range(8):
+            section = os.path.join(self.content, f"section{idx % 3}")
+            os.makedirs(section, exist_ok=True)
+            with open(os.path.join(section, f"page{idx}.md"), "w") as f:
+                f.write(f"# Page {idx}\n\nSome **bold** text and a [link](/page{idx})\n\n* one\n* two")
 
-        text = "#   Hello world   "
-        self.assertEqual(extract_title(text), "Hello world")
+    def tearDown(self):
+        self.tmp.cleanup()
 
-        text = """
-[link](https://foobar.com/baz)
-![image](https://foobar.com/baz.png)
+    def read_tree(self, root):
+        tree = {}
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                with open(path, "rb") as f:
+                    tree[os.path.relpath(path, root)] = f.read()
+        return tree
 
-# This is a heading
+    def test_collect_pages(self):
+        pages = collect_pages(self.content, "public")
+        self.assertEqual(len(pages), 8)
+        self.assertIn((os.path.join(self.content, "section1", "page4.md"), os.path.join("public", "section1", "page4.html")), pages)
 
-```
-def dummy_function():
-    print('Hello, world!')
-```
+    def test_parallel_matches_serial(self):
+        serial = os.path.join(self.root, "serial")
+        parallel = os.path.join(self.root, "parallel")
+        generate_pages_recursively(self.content, self.template, serial)
+        generate_pages_recursively(self.content, self.template, parallel, BuildContext(workers=3))
 
-        #### This is a second heading
+        expected = self.read_tree(serial)
+        self.assertEqual(len(expected), 8)
+        self.assertEqual(self.read_tree(parallel), expected)
 
-1. First line
-2. Second **line**
+    def test_cache_matches_uncached(self):
+        uncached = os.path.join(self.root, "uncached")
+        generate_pages_recursively(self.content, self.template, uncached)
+        expected = self.read_tree(uncached)
 
-        """
+        for workers in (1, 3):
+            cache = BlockCache()
+            cached = os.path.join(self.root, f"cached{workers}")
+            generate_pages_recursively(self.content, self.template, cached, BuildContext(workers=workers, cache=cache))
+            self.assertEqual(self.read_tree(cached), expected)
+            self.assertEqual(cache.hits + cache.misses, 8 * 3)
+            self.assertGreaterEqual(cache.hits, 8 - workers)
 
-        self.assertEqual(extract_title(text), "This is a heading")
+    def test_highlight_cache_from_workers(self):
+        with open(os.path.join(self.content, "section0", "page0.md"), "a") as f:
+            f.write("\n\n```python\nimport os\n```")
+        highlights = BlockCache(name="Highlight cache")
+        generate_pages_recursively(self.content, self.template, os.path.join(self.root, "public"), BuildContext(workers=3, highlights=highlights))
+        self.assertEqual((highlights.hits, highlights.misses), (0, 1))
+        self.assertEqual(list(highlights.entries.values()), ['\n<span class="tok-keyword">import</span> os\n'])
 
-    def test_extract_title_ko(self):
-        text = """
-[link](https://foobar.com/baz)
-![image](https://foobar.com/baz.png)
+def render_and_write(from_path, template, dest_path, cache=None):
+    write_page(dest_path, render_page(from_path, template, cache))
 
-## This is a heading
+class TestStreamLargePage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.template = Template("<title>{{ Title }}</title><article>{{ Content }}</article>")
 
-```
-def dummy_function():
-    print('Hello, world!')
-```
+    def tearDown(self):
+        self.tmp.cleanup()
 
-        #### This is a second heading
+    def render(self, text, func, cache=None):
+        src = os.path.join(self.root, "page.md")
+        dest = os.path.join(self.root, "out", func.__name__ + ".html")
+        with open(src, "w") as f:
+            f.write(text)
+        func(src, self.template, dest, cache)
+        with open(dest) as f:
+            return f.read()
 
-1. First line
-2. Second **line**
+    def test_same_as_render_page(self):
+        text = "Intro *before* title\n\n# The title\n\n" + "\n\n".join(
+            f"Paragraph {idx} with a [link](/page{idx})\n\n```\ncode {idx}\n\nmore\n```\n\n* a\n* b" for idx in range(50)
+        ) + "\n\n# Second title\n"
+        expected = self.render(text, render_and_write)
+        self.assertTrue(expected.startswith("<title>The title</title><article><div><p>Intro <i>before</i> title</p><h1>The title</h1>"))
+        self.assertEqual(self.render(text, stream_page), expected)
+        self.assertEqual(self.render(text, stream_large_page), expected)
+        self.assertEqual(self.render(text, stream_large_page, BlockCache()), expected)
 
-        """
-        with self.assertRaises(Exception):
-            extract_title(text)
\ No newline at end of file
+    def test_title_inside_block(self):
+        for text in ("Intro line\n# The title\n\ntext", "* item\n# The title"):
+            expected = self.render(text, render_and_write)
+            self.assertTrue(expected.startswith("<title>The title</title>"), expected)
+            self.assertEqual(self.render(text, stream_large_page), expected)
+
+    def test_background_writer_streams(self):
+        src = os.path.join(self.root, "page.md")
+        template_path = os.path.join(self.root, "template.html")
+        for path, text in ((src, "# The title\n\ntext"), (template_path, "<title>{{ Title }}</title>{{ Content }}")):
+            with open(path, "w") as f:
+                f.write(text)
+        writer = OutputWriter(background=True)
+        self.addCleanup(writer.close)
+        dest = os.path.join(self.root, "out", "page.html")
+        with mock.patch.object(writer, "write", side_effect=AssertionError("page rendered to one string")):
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_page(src, template_path, dest, BuildContext(writer=writer))
+        with open(dest) as f:
+            self.assertEqual(f.read(), "<title>The title</title><div><h1>The title</h1><p>text</p></div>")
+
+    def test_no_title(self):
+        with self.assertRaisesRegex(Exception, "no header found"):
+            self.render("## Not a title\n\ntext", stream_large_page)
+
+    def test_threshold(self):
+        content = os.path.join(self.root, "content")
+        os.makedirs(content)
+        with open(os.path.join(content, "big.md"), "w") as f:
+            f.write("# Big\n\n" + "\n\n".join(f"Line {idx}" for idx in range(1000)))
+        template_path = os.path.join(self.root, "template.html")
+        with open(template_path, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+
+        import webgen.gen
+        threshold = webgen.gen.STREAM_THRESHOLD
+        outputs = []
+        try:
+            for value, workers in ((1, 1), (1, 2), (threshold, 1)):
+                webgen.gen.STREAM_THRESHOLD = value
+                public = os.path.join(self.root, f"public{len(outputs)}")
+                generate_pages_recursively(content, template_path, public, BuildContext(workers=workers))
+                with open(os.path.join(public, "big.html")) as f:
+                    outputs.append(f.read())
+        finally:
+            webgen.gen.STREAM_THRESHOLD = threshold
+        self.assertEqual(outputs[0], outputs[2])
+        self.assertEqual(outputs[1], outputs[2])
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from data.blocks import BlockType
+from tests.webgen.helpers import make_site, write
+from webgen.linkcheck import LinkIndex, link_target, resolves
+from webgen.siteindex import PageSummary
+
+class TestLinkTarget(unittest.TestCase):
+    def test_link_target(self):
+        self.assertEqual(link_target("/blog/post.html", "/images/a.png"), "/images/a.png")
+        self.assertEqual(link_target("/blog/post.html", "other.html#intro"), "/blog/other.html")
+        self.assertEqual(link_target("/blog/post.html", "../about?lang=en"), "/about")
+        self.assertEqual(link_target("/index.html", "/my%20file.pdf"), "/my file.pdf")
+        for url in ("https://example.com/", "mailto:me@example.com", "//cdn.example.com/a.js", "#top"):
+            self.assertIsNone(link_target("/index.html", url))
+
+    def test_resolves(self):
+        urls = {"/index.html", "/blog/index.html", "/blog/post.html", "/index.css"}
+        for target in ("/", "/blog", "/blog/", "/blog/post", "/blog/post.html", "/index.css"):
+            self.assertTrue(resolves(target, urls), target)
+        for target in ("/about", "/blog/other.html", "/index.js"):
+            self.assertFalse(resolves(target, urls), target)
+
+    def test_check(self):
+        summary = PageSummary(urls=True)
+        summary.add(BlockType.HEADING, ["# [Post](/gone)"])
+        for line in ("[home](/) [up](..) [gone](/gone) [ext](https://example.com/)", "![logo](/logo.png) ![photo](photo.jpg)"):
+            summary.add(BlockType.PARAGRAPH, [line])
+        index = LinkIndex("public")
+        index.add("content/blog/post.md", os.path.join("public", "blog", "post.html"), summary)
+        report = index.check([os.path.join("public", "index.html"), os.path.join("public", "blog", "post.html")], ["/logo.png"])
+        self.assertEqual(report.checked, 5)
+        self.assertEqual(report.targets, 4)
+        self.assertEqual(report.broken, [
+            {"page": "/blog/post.html", "source": "content/blog/post.md", "kind": "link", "url": "/gone", "target": "/gone"},
+            {"page": "/blog/post.html", "source": "content/blog/post.md", "kind": "image", "url": "photo.jpg", "target": "/blog/photo.jpg"},
+        ])
+        self.assertEqual(report.summary(), "Links: 5 checked (4 distinct targets), 1 broken links, 1 missing images")
+
+class TestSiteLinkCheck(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.report = os.path.join(self.root, "link-report.json")
+        os.makedirs(os.path.join(self.root, "content", "blog"))
+        os.makedirs(os.path.join(self.root, "static", "images"))
+        write(os.path.join(self.root, "template.html"), '<link href="/index.css">{{ Title }}{{ Content }}')
+        write(os.path.join(self.root, "static", "index.css"), "body {}")
+        write(os.path.join(self.root, "static", "images", "logo.png"), "png")
+        write(os.path.join(self.root, "content", "index.md"), "# Home\n\n![logo](/images/logo.png) [post](/blog/post) [feed](/feed.xml)")
+        write(os.path.join(self.root, "content", "blog", "post.md"), "# Post\n\n- [home](/)\n- [missing](../missing.html)\n\n![chart](chart.svg)")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def site(self, **kwargs):
+        return make_site(self.root, cache_path=None, highlight_path=None, check_links=True, site_index=True, **kwargs)
+
+    def broken(self):
+        with open(self.report) as f:
+            return [(item["page"], item["kind"], item["url"]) for item in json.load(f)["broken"]]
+
+    def test_build_reports_broken_links(self):
+        for fingerprint in (False, True):
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                self.site(fingerprint=fingerprint).build()
+            self.assertEqual(self.broken(), [("/blog/post.html", "link", "../missing.html"), ("/blog/post.html", "image", "chart.svg")])
+            self.assertIn("Links: 6 checked (6 distinct targets), 1 broken links, 1 missing images", out.getvalue())
+
+    def test_rebuild_rechecks_unchanged_pages(self):
+        site = self.site()
+        with contextlib.redirect_stdout(io.StringIO()):
+            site.build()
+            write(os.path.join(self.root, "content", "missing.md"), "# Found")
+            site.rebuild([os.path.join(self.root, "content", "missing.md")])
+        self.assertEqual(self.broken(), [("/blog/post.html", "image", "chart.svg")])
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            os.remove(os.path.join(self.root, "content", "blog", "post.md"))
+            site.rebuild([os.path.join(self.root, "content", "blog", "post.md")])
+        self.assertEqual(self.broken(), [("/index.html", "link", "/blog/post")])
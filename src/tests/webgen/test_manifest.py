@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+
+from tests.webgen.helpers import write
+from webgen.fs import copy_files
+from webgen.gen import BuildContext, generate_pages_recursively
+from webgen.manifest import Manifest, file_hash
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.public = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+        os.makedirs(os.path.join(self.content, "blog"))
+        os.makedirs(self.static)
+        write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nSome *text*")
+        write(os.path.join(self.static, "index.css"), "body {}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self):
+        manifest = Manifest(self.manifest_path)
+        copy_files(self.static, self.public, manifest)
+        generate_pages_recursively(self.content, self.template, self.public, BuildContext(manifest=manifest))
+        manifest.prune()
+        manifest.save()
+        return manifest
+
+    def mtimes(self):
+        return {
+            name: os.stat(os.path.join(self.public, name)).st_mtime_ns
+            for name in ("index.html", os.path.join("blog", "post.html"), "index.css")
+        }
+
+    def test_file_hash(self):
+        path = os.path.join(self.root, "a.txt")
+        write(path, "foo")
+        self.assertEqual(file_hash(path), "2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae")
+
+    def test_records_outputs(self):
+        manifest = self.build()
+        dest = os.path.join(self.public, "index.html")
+        self.assertEqual(manifest.entries[dest]["source"], os.path.join(self.content, "index.md"))
+        self.assertEqual(manifest.entries[dest]["template"], file_hash(self.template))
+        self.assertIsNone(manifest.entries[os.path.join(self.public, "index.css")]["template"])
+
+        reloaded = Manifest(self.manifest_path)
+        self.assertEqual(reloaded.entries, manifest.entries)
+        self.assertEqual(reloaded.outputs[dest], [os.stat(dest).st_mtime_ns, file_hash(dest)])
+        self.assertEqual(reloaded.outputs, manifest.outputs)
+
+    def test_skip_unchanged(self):
+        self.build()
+        before = self.mtimes()
+        os.utime(os.path.join(self.content, "index.md"))
+        self.build()
+        self.assertEqual(self.mtimes(), before)
+
+    def test_rebuild_changed(self):
+        self.build()
+        before = self.mtimes()
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nOther *text*")
+        self.build()
+        after = self.mtimes()
+        self.assertNotEqual(after[os.path.join("blog", "post.html")], before[os.path.join("blog", "post.html")])
+        self.assertEqual(after["index.html"], before["index.html"])
+        self.assertEqual(after["index.css"], before["index.css"])
+
+        with open(os.path.join(self.public, "blog", "post.html")) as f:
+            self.assertIn("Other", f.read())
+
+    def test_rebuild_on_template_change(self):
+        self.build()
+        write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.build()
+        with open(os.path.join(self.public, "index.html")) as f:
+            self.assertTrue(f.read().startswith("<h1>Home</h1>"))
+
+    def test_rebuild_missing_output(self):
+        self.build()
+        os.remove(os.path.join(self.public, "index.html"))
+        self.build()
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_remove_deleted_sources(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        os.remove(os.path.join(self.static, "index.css"))
+        manifest = self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog", "post.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.css")))
+        self.assertEqual(list(manifest.entries), [os.path.join(self.public, "index.html")])
+
+    def test_truncated_manifest(self):
+        self.build()
+        with open(self.manifest_path, "r+") as f:
+            f.truncate(10)
+        manifest = self.build()
+        self.assertIn(os.path.join(self.public, "index.html"), manifest.entries)
+        self.assertEqual(Manifest(self.manifest_path).entries, manifest.entries)
@@ -0,0 +1,91 @@
+import contextlib
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from data.blocks import BlockType
+from tests.webgen.helpers import make_site, write
+from webgen.search import block_tokens, encode_postings, shard_of, tokenize
+
+class TestTokenize(unittest.TestCase):
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Hello, *World* of `code_x`!"), ["hello", "world", "of", "code_x"])
+
+    def test_block_tokens(self):
+        self.assertEqual(block_tokens(BlockType.HEADING, ["## Some **Title**"]), ["some", "title"])
+        self.assertEqual(block_tokens(BlockType.UNORDERED_LIST, ["* one", "* two"]), ["one", "two"])
+        self.assertEqual(block_tokens(BlockType.ORDERED_LIST, ["1. one", "2. two"]), ["one", "two"])
+        self.assertEqual(block_tokens(BlockType.QUOTE, ["> quoted"]), ["quoted"])
+        self.assertEqual(block_tokens(BlockType.CODE, ["```", "print(x)", "```"]), ["print", "x"])
+        self.assertEqual(
+            block_tokens(BlockType.PARAGRAPH, ["See [the docs](/docs/intro.html) and ![a logo](/logo.png)"]),
+            ["see", "the", "docs", "and", "a", "logo"],
+        )
+
+    def test_encode_postings(self):
+        self.assertEqual(encode_postings([(2, 1), (5, 3), (6, 1)]), [2, 1, 3, 3, 1, 1])
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.public = os.path.join(self.root, "public")
+        os.makedirs(os.path.join(self.content, "blog"))
+        os.makedirs(os.path.join(self.root, "static"))
+        self.template = os.path.join(self.root, "template.html")
+        write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome to the [blog](/blog/post.html)")
+        write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nWelcome welcome *reader*")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def site(self, **kwargs):
+        return make_site(self.root, search=True, **kwargs)
+
+    def build(self, site, paths=None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if paths is None:
+                site.build()
+            else:
+                site.rebuild(paths)
+
+    def meta(self):
+        with open(os.path.join(self.public, "search", "meta.json")) as f:
+            return json.load(f)
+
+    def postings(self, term):
+        meta = self.meta()
+        with gzip.open(os.path.join(self.public, "search", f"{shard_of(term, meta['shards']):02x}.json.gz")) as f:
+            return json.load(f).get(term)
+
+    def test_build(self):
+        self.build(self.site(workers=2))
+        meta = self.meta()
+        self.assertEqual(meta["pages"], [["/blog/post.html", "Post"], ["/index.html", "Home"]])
+        self.assertEqual(self.postings("welcome"), [0, 2, 1, 1])
+        self.assertEqual(self.postings("blog"), [1, 1])
+        self.assertIsNone(self.postings("html"))
+
+    def test_incremental(self):
+        self.build(self.site())
+        shard = os.path.join(self.public, "search", f"{shard_of('reader', self.meta()['shards']):02x}.json.gz")
+        os.utime(shard, ns=(0, 0))
+        self.build(self.site())
+        self.assertEqual(os.stat(shard).st_mtime_ns, 0)
+
+        site = self.site()
+        post = os.path.join(self.content, "blog", "post.md")
+        write(post, "# Post\n\nHello *writer*")
+        self.build(site, [post])
+        self.assertIsNone(self.postings("reader"))
+        self.assertEqual(self.postings("writer"), [0, 1])
+
+        os.remove(post)
+        self.build(site, [post])
+        self.assertEqual(self.meta()["pages"], [["/index.html", "Home"]])
+        self.assertEqual(self.postings("welcome"), [0, 1])
@@ -0,0 +1,124 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from tests.webgen.helpers import make_site, write
+from webgen.shard import ShardError, balance, check_coverage, parse_shard
+
+MAIN = os.path.join(os.path.dirname(__file__), "..", "..", "main.py")
+
+class TestShardSpec(unittest.TestCase):
+    def test_parse(self):
+        shard = parse_shard("3/8")
+        self.assertEqual((shard.index, shard.count, shard.label), (3, 8, "3-of-8"))
+        for spec in ("0/8", "9/8", "3", "a/b", "1/0"):
+            with self.assertRaises(ValueError):
+                parse_shard(spec)
+
+    def test_file_list(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "list.txt")
+            with open(path, "w") as f:
+                f.write("content/a.md\n\n./content/b.md\n")
+            shard = parse_shard("@" + path)
+            pages = [("content/a.md", "public/a.html"), ("content/b.md", "public/b.html"), ("content/c.md", "public/c.html")]
+            self.assertEqual(shard.select(pages), pages[:2])
+            self.assertEqual(shard.label, "list.txt")
+
+    def test_balance(self):
+        with tempfile.TemporaryDirectory() as root:
+            pages = []
+            for name, size in (("a", 900), ("b", 500), ("c", 400), ("d", 300), ("e", 100)):
+                path = os.path.join(root, name)
+                with open(path, "w") as f:
+                    f.write("x" * size)
+                pages.append((path, path + ".html"))
+            shards = balance(pages, 2)
+            self.assertEqual([[os.path.basename(src) for src, _ in shard] for shard in shards], [["a", "d"], ["b", "c", "e"]])
+            self.assertEqual(balance(list(reversed(pages)), 2), shards)
+
+    def test_check_coverage(self):
+        pages = [("content/a.md", "a.html"), ("content/b.md", "b.html"), ("content/c.md", "c.html")]
+        check_coverage(pages, [("1-of-2", ["content/a.md"]), ("2-of-2", ["content/b.md", "content/c.md"])])
+        with self.assertRaisesRegex(ShardError, r"missing from every shard: content/c.md; built by several shards: content/a.md \(1-of-2 and 2-of-2\)"):
+            check_coverage(pages, [("1-of-2", ["content/a.md"]), ("2-of-2", ["content/a.md", "content/b.md"])])
+
+class TestShardedBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        os.makedirs(os.path.join(self.root, "content", "blog"))
+        os.makedirs(os.path.join(self.root, "static"))
+        write(os.path.join(self.root, "template.html"), '<link href="/index.css">{{ Title }}{{ Content }}')
+        write(os.path.join(self.root, "static", "index.css"), "body {}")
+        for idx in range(7):
+            write(os.path.join(self.root, "content", "blog", f"post{idx}.md"), f"# Post {idx}\n\n" + "Text. " * (idx * 40))
+        write(os.path.join(self.root, "content", "index.md"), "# Home\n\n[first](/blog/post0.html)")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_tree(self, public):
+        tree = {}
+        for base_dir, _, files in os.walk(os.path.join(self.root, public)):
+            for name in files:
+                path = os.path.join(base_dir, name)
+                with open(path, "rb") as f:
+                    tree[os.path.relpath(path, os.path.join(self.root, public))] = f.read()
+        return tree
+
+    def run_main(self, *args):
+        return subprocess.run(
+            [sys.executable, os.path.abspath(MAIN), *args],
+            cwd=self.root, capture_output=True, text=True,
+        )
+
+    def test_shards_in_separate_processes(self):
+        options = ["--fingerprint", "--site-index", "--search"]
+        processes = [
+            subprocess.Popen(
+                [sys.executable, os.path.abspath(MAIN), "build", "--shard", f"{idx}/3", "-o", f"shard{idx}", *options],
+                cwd=self.root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+            )
+            for idx in range(1, 4)
+        ]
+        for process in processes:
+            self.assertEqual(process.wait(), 0, process.stderr.read())
+            process.stderr.close()
+
+        built = [set(self.read_tree(f"shard{idx}")) for idx in range(1, 4)]
+        self.assertTrue(all(any(name.endswith(".html") for name in names) for names in built))
+
+        result = self.run_main("merge", "shard1", "shard2", "shard3", "-o", "merged", *options)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        result = self.run_main("build", "-o", "single", "--full", *options)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(self.read_tree("merged"), self.read_tree("single"))
+
+        result = self.run_main("merge", "shard1", "shard2", "-o", "partial")
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("missing from every shard", result.stderr)
+
+    def test_outputs_keep_separate_state(self):
+        for args in (("-o", "staging"), ()):
+            result = self.run_main("build", *args)
+            self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertNotIn("Remove stale output", result.stdout)
+        self.assertEqual(self.read_tree("staging"), self.read_tree("public"))
+
+    def test_merge_rejects_duplicates(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for idx in (1, 2):
+                shard_list = os.path.join(self.root, f"list{idx}.txt")
+                write(shard_list, "\n".join(os.path.join(self.root, "content", name) for name in ("index.md", os.path.join("blog", f"post{idx}.md"))))
+                make_site(
+                    self.root, public=os.path.join(self.root, f"shard{idx}"), manifest_path=os.path.join(self.root, f"manifest{idx}.json"),
+                    cache_path=None, highlight_path=None, deps_path=None, shard=parse_shard("@" + shard_list),
+                ).build()
+            site = make_site(self.root, cache_path=None, highlight_path=None, deps_path=None)
+            with self.assertRaisesRegex(ShardError, "built by several shards: .*index.md"):
+                site.merge([os.path.join(self.root, "shard1"), os.path.join(self.root, "shard2")])
@@ -0,0 +1,111 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from data.blocks import BlockType, scan_blocks
+from tests.webgen.helpers import make_site, write
+from webgen.siteindex import PageSummary
+
+class TestPageSummary(unittest.TestCase):
+    def test_summary(self):
+        text = "Intro text\n\n```\n# not a title\n```\n\n# The title\n\n## Part *one*\n\n* a b\n* c"
+        summary = PageSummary()
+        blocks = list(summary.scan(scan_blocks(text.splitlines())))
+        self.assertEqual(len(blocks), 5)
+        self.assertEqual(summary.title, "The title")
+        self.assertEqual(summary.headings, [[1, "The title"], [2, "Part *one*"]])
+        self.assertEqual(summary.words, 19)
+
+    def test_title_inside_block(self):
+        for text in ("Intro line\n# Title\n\ntext", "* item\n# Title", "[link](/a)\n\n  #   Title  "):
+            summary = PageSummary()
+            list(summary.scan(scan_blocks(text.splitlines())))
+            self.assertEqual(summary.title, "Title", text)
+
+    def test_urls_only_when_requested(self):
+        lines = ["See [a](/a) and ![b](/b.png)"]
+        summary = PageSummary()
+        summary.add(BlockType.PARAGRAPH, lines)
+        self.assertEqual((summary.links, summary.images), (set(), set()))
+        summary = PageSummary(urls=True)
+        summary.add(BlockType.PARAGRAPH, lines)
+        self.assertEqual((summary.links, summary.images), ({"/a"}, {"/b.png"}))
+
+    def test_no_title(self):
+        summary = PageSummary()
+        for block in scan_blocks(["## Sub", "", "```", "# code", "```", "", "#nospace"]):
+            summary.add(*block)
+        with self.assertRaisesRegex(Exception, "no header found"):
+            summary.require_title()
+
+class TestSiteIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, "content")
+        os.makedirs(os.path.join(self.content, "blog"))
+        os.makedirs(os.path.join(self.root, "static"))
+        self.template = os.path.join(self.root, "template.html")
+        write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        write(os.path.join(self.content, "blog", "post.md"), "# Post & co\n\n## Details\n\nSome *text*")
+        os.utime(os.path.join(self.content, "index.md"), ns=(0, 0))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, name):
+        with open(os.path.join(self.root, "public", name)) as f:
+            return f.read()
+
+    def site(self, **kwargs):
+        return make_site(self.root, site_index=True, base_url="https://example.com/", **kwargs)
+
+    def build(self, site):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            site.build()
+        return out.getvalue()
+
+    def test_index(self):
+        site = self.site()
+        self.build(site)
+        post = site.index.pages[os.path.join(self.root, "public", "blog", "post.html")]
+        self.assertEqual(post["url"], "/blog/post.html")
+        self.assertEqual(post["title"], "Post & co")
+        self.assertEqual(post["headings"], [[1, "Post & co"], [2, "Details"]])
+        self.assertEqual(post["words"], 8)
+
+        sitemap = self.read("sitemap.xml")
+        self.assertIn("<url><loc>https://example.com/index.html</loc><lastmod>1970-01-01T00:00:00+00:00</lastmod></url>", sitemap)
+        self.assertIn("<loc>https://example.com/blog/post.html</loc>", sitemap)
+        feed = self.read("feed.xml")
+        self.assertLess(feed.index("Post &amp; co"), feed.index("<title>Home</title>"))
+        self.assertEqual(
+            self.read("sections.html"),
+            '<title>Sections</title><div><h2>Home</h2><ul><li><a href="/index.html">Home</a> (3 words)</li></ul>'
+            '<h2>blog</h2><ul><li><a href="/blog/post.html">Post &amp; co</a> (8 words)</li></ul></div>',
+        )
+
+    def test_incremental(self):
+        self.build(self.site(workers=2))
+        sitemap = self.read("sitemap.xml")
+        out = self.build(self.site())
+        self.assertNotIn("Generate page", out)
+        self.assertEqual(self.read("sitemap.xml"), sitemap)
+
+        os.remove(os.path.join(self.root, "index.json"))
+        out = self.build(self.site())
+        self.assertIn("Generate page", out)
+        self.assertEqual(self.read("sitemap.xml"), sitemap)
+
+    def test_rebuild_removed_page(self):
+        site = self.site()
+        self.build(site)
+        post = os.path.join(self.content, "blog", "post.md")
+        os.remove(post)
+        with contextlib.redirect_stdout(io.StringIO()):
+            site.rebuild([post])
+        self.assertNotIn("post.html", self.read("sitemap.xml"))
+        self.assertNotIn("blog", self.read("sections.html"))
@@ -0,0 +1,52 @@
+import io
+import os
+import tempfile
+import unittest
+
+from webgen.template import Template
+
+class TestTemplate(unittest.TestCase):
+    def test_split(self):
+        template = Template("<title> {{ Title }} </title><article>{{ Content }}</article>")
+        self.assertEqual(template.segments, ["<title> ", " </title><article>", "</article>"])
+        self.assertEqual(template.slots, ["Title", "Content"])
+
+        template = Template("no placeholder")
+        self.assertEqual(template.segments, ["no placeholder"])
+        self.assertEqual(template.slots, [])
+
+    def test_render(self):
+        template = Template("<title> {{ Title }} </title><article>{{ Content }}</article>")
+        self.assertEqual(
+            template.render({"Title": "Hello", "Content": "<p>world</p>"}),
+            "<title> Hello </title><article><p>world</p></article>"
+        )
+
+    def test_render_named_placeholders(self):
+        template = Template("{{Title}}|{{ date }}|{{  description  }}|{{ Title }}")
+        self.assertEqual(template.slots, ["Title", "date", "description", "Title"])
+        self.assertEqual(
+            template.render({"Title": "T", "date": "2024-01-01", "description": "D"}),
+            "T|2024-01-01|D|T"
+        )
+
+    def test_render_missing_value(self):
+        template = Template("<nav>{{ nav }}</nav>{{ Content }}")
+        self.assertEqual(template.render({"Content": "body"}), "<nav>{{ nav }}</nav>body")
+
+    def test_render_does_not_expand_values(self):
+        template = Template("{{ Title }}{{ Content }}")
+        self.assertEqual(template.render({"Title": "{{ Content }}", "Content": "x"}), "{{ Content }}x")
+
+    def test_write(self):
+        template = Template("<title>{{ Title }}</title><article>{{ Content }}</article>{{ nav }}")
+        out = io.StringIO()
+        template.write(out, {"Title": "Hello", "Content": iter(["<p>", "world", "</p>"])})
+        self.assertEqual(out.getvalue(), "<title>Hello</title><article><p>world</p></article>{{ nav }}")
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "template.html")
+            with open(path, "w") as f:
+                f.write("<h1>{{ Title }}</h1>")
+            self.assertEqual(Template.from_file(path), Template("<h1>{{ Title }}</h1>"))
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from webgen.serve import inject_reload, RELOAD_SCRIPT
+from webgen.watch import diff_snapshots, snapshot, wait_for_changes
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        os.makedirs(os.path.join(self.root, "content", "blog"))
+        self.page = os.path.join(self.root, "content", "blog", "post.md")
+        self.template = os.path.join(self.root, "template.html")
+        for path in (self.page, self.template):
+            with open(path, "w") as f:
+                f.write("initial")
+        self.paths = [os.path.join(self.root, "content"), self.template]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_snapshot(self):
+        self.assertEqual(set(snapshot(self.paths)), {self.page, self.template})
+
+    def test_diff_snapshots(self):
+        old = {"a": (1, 1), "b": (1, 1), "c": (1, 1)}
+        new = {"a": (1, 1), "b": (2, 1), "d": (1, 1)}
+        self.assertEqual(diff_snapshots(old, new), {"b", "c", "d"})
+
+    def test_wait_for_changes(self):
+        state = snapshot(self.paths)
+        new_page = os.path.join(self.root, "content", "new.md")
+
+        def edit():
+            time.sleep(0.05)
+            with open(new_page, "w") as f:
+                f.write("new")
+            time.sleep(0.05)
+            os.remove(self.page)
+
+        thread = threading.Thread(target=edit)
+        thread.start()
+        changed, state = wait_for_changes(self.paths, state, interval=0.01, debounce=0.2)
+        thread.join()
+        self.assertEqual(changed, {new_page, self.page})
+        self.assertEqual(set(state), {new_page, self.template})
+
+class TestServe(unittest.TestCase):
+    def test_inject_reload(self):
+        html = inject_reload(b"<html><body><p>hello</p></body></html>")
+        self.assertEqual(html, b"<html><body><p>hello</p>" + RELOAD_SCRIPT.encode() + b"</body></html>")
+        self.assertEqual(inject_reload(b"<p>hello</p>"), b"<p>hello</p>" + RELOAD_SCRIPT.encode())
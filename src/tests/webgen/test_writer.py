@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from webgen.writer import OutputWriter
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.path = os.path.join(self.root, "out", "blog", "post.html")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def test_write(self):
+        writer = OutputWriter()
+        writer.write(self.path, "<p>héllo</p>")
+        self.assertEqual(self.read(), "<p>héllo</p>")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["post.html"])
+        stats = writer.wait()
+        self.assertEqual((stats.written, stats.unchanged, stats.bytes_written), (1, 0, 13))
+
+    def test_skip_identical(self):
+        writer = OutputWriter()
+        writer.write(self.path, "<p>same</p>")
+        os.utime(self.path, ns=(0, 0))
+        writer.write(self.path, "<p>same</p>")
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+        writer.write(self.path, "<p>diff</p>")
+        self.assertEqual(self.read(), "<p>diff</p>")
+        stats = writer.wait()
+        self.assertEqual((stats.written, stats.unchanged), (2, 1))
+
+    def test_recorded_digest(self):
+        digests = {}
+        writer = OutputWriter(digests=digests)
+        writer.write(self.path, "<p>same</p>")
+        mtime_ns, digest = digests[self.path]
+        self.assertEqual(mtime_ns, os.stat(self.path).st_mtime_ns)
+        # a matching recorded digest is trusted without reading the output back
+        digests[self.path] = [mtime_ns, "recorded"]
+        writer.write(self.path, "<p>same</p>")
+        self.assertEqual(digests[self.path], [os.stat(self.path).st_mtime_ns, digest])
+        # an output touched since it was recorded is hashed again
+        writer.write(self.path, "<p>diff</p>")
+        os.utime(self.path, ns=(0, 0))
+        writer.write(self.path, "<p>diff</p>")
+        stats = writer.wait()
+        self.assertEqual((stats.written, stats.unchanged), (3, 1))
+
+    def test_open(self):
+        writer = OutputWriter()
+        for _ in range(2):
+            with writer.open(self.path) as f:
+                f.write("<div>")
+                f.writelines(["a", "b"])
+                f.write("</div>")
+        self.assertEqual(self.read(), "<div>ab</div>")
+        stats = writer.wait()
+        self.assertEqual((stats.written, stats.unchanged), (1, 1))
+
+    def test_open_failure_keeps_old_output(self):
+        writer = OutputWriter()
+        writer.write(self.path, "old")
+        with self.assertRaises(ValueError):
+            with writer.open(self.path) as f:
+                f.write("partial")
+                raise ValueError()
+        self.assertEqual(self.read(), "old")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["post.html"])
+
+    def test_background(self):
+        writer = OutputWriter(background=True, max_pending=2)
+        paths = [os.path.join(self.root, "out", f"page{idx}.html") for idx in range(20)]
+        for idx, path in enumerate(paths):
+            writer.write(path, f"page {idx}")
+        stats = writer.wait()
+        self.assertEqual(stats.written, 20)
+        for idx, path in enumerate(paths):
+            with open(path) as f:
+                self.assertEqual(f.read(), f"page {idx}")
+        writer.close()
+
+    def test_background_error(self):
+        writer = OutputWriter(background=True)
+        blocker = os.path.join(self.root, "file")
+        with open(blocker, "w") as f:
+            f.write("")
+        writer.write(os.path.join(blocker, "page.html"), "page")
+        with self.assertRaises(OSError):
+            writer.flush()
+        writer.close()
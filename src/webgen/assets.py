@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+
+from persist import load_json, save_json
+from webgen.manifest import file_hash
+
+ASSETS_PATH = ".build/assets.json"
+ASSET_MANIFEST = "asset-manifest.json"
+HASH_LENGTH = 10
+
+def fingerprint_name(rel_path, digest):
+    base, ext = os.path.splitext(rel_path)
+    return f"{base}.{digest[:HASH_LENGTH]}{ext}"
+
+def asset_url(rel_path):
+    return "/" + rel_path.replace(os.sep, "/")
+
+class AssetMap:
+    def __init__(self, path=None, static="static"):
+        self.path = path
+        self.static = static
+        self.entries = {}
+        self.urls = {}
+        if path is not None:
+            self.entries = load_json(path, {})
+
+    def reset(self):
+        self.urls = {}
+
+    def fingerprint(self, src_file, rel_path):
+        st = os.stat(src_file)
+        entry = self.entries.get(rel_path)
+        if entry is None or entry["size"] != st.st_size or entry["mtime"] != st.st_mtime_ns:
+            entry = {"hash": file_hash(src_file), "size": st.st_size, "mtime": st.st_mtime_ns}
+            self.entries[rel_path] = entry
+        fingerprinted = fingerprint_name(rel_path, entry["hash"])
+        self.urls[asset_url(rel_path)] = asset_url(fingerprinted)
+        return fingerprinted
+
+    def scan(self, static):
+        for root, _, files in os.walk(static):
+            for name in files:
+                src_file = os.path.join(root, name)
+                self.fingerprint(src_file, os.path.relpath(src_file, static))
+
+    def source_of(self, url):
+        return os.path.join(self.static, *url.lstrip("/").split("/"))
+
+    def hashes(self):
+        return {rel_path: entry["hash"] for rel_path, entry in self.entries.items()}
+
+    def changed(self, previous):
+        current = {rel_path: digest for rel_path, digest in self.hashes().items() if asset_url(rel_path) in self.urls}
+        changed = {rel_path for rel_path, digest in current.items() if previous.get(rel_path) != digest}
+        changed.update(rel_path for rel_path in previous if rel_path not in current)
+        return sorted(os.path.join(self.static, rel_path) for rel_path in changed)
+
+    def digest(self):
+        return hashlib.sha256(json.dumps(sorted(self.urls.items())).encode()).hexdigest()
+
+    def save(self, public):
+        self.entries = {
+            rel_path: entry for rel_path, entry in self.entries.items()
+            if asset_url(rel_path) in self.urls
+        }
+        if self.path is not None:
+            save_json(self.path, self.entries, indent=1, sort_keys=True)
+        save_json(os.path.join(public, ASSET_MANIFEST), self.urls, indent=1, sort_keys=True)
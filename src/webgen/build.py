@@ -0,0 +1,283 @@
+import hashlib
+import os
+
+import instrument
+from data.cache import BlockCache
+from webgen.assets import ASSETS_PATH, AssetMap
+from webgen.compress import Compressor, gzip_path
+from webgen.deps import DEPS_PATH, DependencyGraph
+from webgen.fs import SyncStats, copy_data, copy_file, copy_files, is_same_file
+from webgen.gen import BuildContext, collect_pages, generate_pages, generate_pages_recursively, page_dest_path, page_template
+from webgen.linkcheck import LINK_REPORT_PATH, LINKS_PATH, LinkIndex
+from webgen.manifest import Manifest
+from webgen.search import SEARCH_PATH, SearchIndex
+from webgen.shard import ShardError, check_coverage, load_shard, shard_path
+from webgen.siteindex import INDEX_PATH, SiteIndex, page_url, write_artifacts
+from webgen.writer import OutputWriter
+
+MANIFEST_PATH = ".build/manifest.json"
+BLOCK_CACHE_PATH = ".build/blocks.pickle"
+HIGHLIGHT_CACHE_PATH = ".build/highlight.pickle"
+
+def relative_to(path, root):
+    rel_path = os.path.relpath(path, root)
+    if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+        return None
+    return rel_path
+
+def output_state_paths(public):
+    # the manifest and page indexes describe one output directory, so other -o targets get their own
+    paths = {
+        "manifest_path": MANIFEST_PATH, "deps_path": DEPS_PATH, "index_path": INDEX_PATH,
+        "search_path": SEARCH_PATH, "links_path": LINKS_PATH, "link_report_path": LINK_REPORT_PATH,
+    }
+    if os.path.normpath(public) == "public":
+        return paths
+    full_path = os.path.abspath(public)
+    state_dir = f"{os.path.basename(full_path)}-{hashlib.sha1(full_path.encode()).hexdigest()[:10]}"
+    return {name: os.path.join(os.path.dirname(path), "outputs", state_dir, os.path.basename(path)) for name, path in paths.items()}
+
+class Site:
+    def __init__(
+        self, content="content", static="static", template="template.html", public="public",
+        manifest_path=MANIFEST_PATH, workers=1, cache_path=BLOCK_CACHE_PATH, cache_size=4096,
+        checksum=False, link="copy", compress=False, fingerprint=False, assets_path=ASSETS_PATH,
+        site_index=False, index_path=INDEX_PATH, base_url="", search=False, search_path=SEARCH_PATH, shard=None,
+        highlight_path=HIGHLIGHT_CACHE_PATH, highlight_size=16384, deps_path=DEPS_PATH, explain=False,
+        check_links=False, links_path=LINKS_PATH, link_report_path=LINK_REPORT_PATH,
+    ):
+        if shard is not None:
+            manifest_path = shard_path(public, "manifest.json")
+            deps_path = shard_path(public, "deps.pickle")
+            index_path = shard_path(public, "index.json")
+            search_path = shard_path(public, "search.pickle")
+            links_path = shard_path(public, "links.pickle")
+        self.shard = shard
+        self.content = content
+        self.static = static
+        self.template = template
+        self.public = public
+        self.checksum = checksum
+        self.link = link
+        self.base_url = base_url.rstrip("/")
+        self.manifest = Manifest(manifest_path)
+        self.cache = BlockCache(cache_size, cache_path)
+        self.highlights = BlockCache(highlight_size, highlight_path, "Highlight cache")
+        self.compressor = Compressor() if compress else None
+        self.assets = AssetMap(assets_path, static) if fingerprint else None
+        self.writer = OutputWriter(background=True, digests=self.manifest.outputs)
+        self.index = SiteIndex(public, index_path) if site_index else None
+        self.search = SearchIndex(public, search_path) if search else None
+        self.graph = DependencyGraph(deps_path)
+        self.links = LinkIndex(public, links_path) if check_links else None
+        self.link_report_path = link_report_path
+        self.context = BuildContext(
+            public=public, manifest=self.manifest, workers=workers, cache=self.cache, highlights=self.highlights, writer=self.writer,
+            compressor=self.compressor, assets=self.assets, index=self.index, search=self.search, graph=self.graph,
+            links=self.links, explain=explain,
+        )
+
+    def build(self, full=False):
+        self.manifest.reset()
+        if full:
+            self.manifest.entries = {}
+        previous = None
+        if self.assets is not None:
+            previous = self.assets.hashes()
+            self.assets.reset()
+
+        if self.shard is None:
+            self.copy_static()
+        elif self.assets is not None:
+            self.assets.scan(self.static)
+        changed = [] if self.assets is None else self.assets.changed(previous)
+        with instrument.timer("generate_pages"):
+            generate_pages_recursively(self.content, self.template, self.public, self.context, self.shard, self.graph.affected(changed))
+
+        self.prune()
+        self.finish()
+
+    def copy_static(self):
+        with instrument.timer("copy_files"):
+            stats = copy_files(self.static, self.public, self.manifest, self.checksum, self.link, self.compressor, self.assets)
+        print(stats.summary())
+
+    def prune(self):
+        for dest in self.manifest.prune():
+            print(f"Remove stale output {dest}")
+        if self.index is not None:
+            self.index.prune(self.manifest.entries)
+        if self.search is not None:
+            self.search.prune(self.manifest.entries)
+        self.graph.prune(self.manifest.entries)
+        if self.links is not None:
+            self.links.prune(self.manifest.entries)
+
+    def merge(self, shard_dirs):
+        if self.shard is not None:
+            raise ShardError("cannot merge into a shard")
+        self.manifest.reset()
+        if self.assets is not None:
+            self.assets.reset()
+
+        shards = [(shard_dir, load_shard(shard_dir)) for shard_dir in shard_dirs]
+        check_coverage(collect_pages(self.content, self.public), [(meta["label"], meta["sources"]) for _, meta in shards])
+
+        self.copy_static()
+        stats = SyncStats()
+        merged = {}
+        with instrument.timer("merge_shards"):
+            for shard_dir, meta in shards:
+                self.merge_shard(shard_dir, meta["label"], merged, stats)
+        print(stats.summary())
+
+        self.prune()
+        self.finish()
+
+    def merge_shard(self, shard_dir, label, merged, stats):
+        manifest = Manifest(shard_path(shard_dir, "manifest.json"))
+        for dest, entry in manifest.entries.items():
+            rel_path = os.path.relpath(dest, shard_dir)
+            if rel_path in merged:
+                raise ShardError(f"{rel_path} was generated by shards {merged[rel_path]} and {label}")
+            merged[rel_path] = label
+
+            final = os.path.join(self.public, rel_path)
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            for src_file, dest_file in ((dest, final), (gzip_path(dest), gzip_path(final))):
+                if not os.path.exists(src_file):
+                    continue
+                src_stat = os.stat(src_file)
+                if is_same_file(src_file, src_stat, dest_file, self.checksum):
+                    stats.skipped += 1
+                    stats.bytes_skipped += src_stat.st_size
+                else:
+                    copy_data(src_file, dest_file, self.link)
+                    stats.copied += 1
+                    stats.bytes_copied += src_stat.st_size
+            self.manifest.adopt(final, entry)
+            if self.compressor is not None:
+                self.compressor.ensure(final)
+
+        if self.index is not None:
+            index = SiteIndex(shard_dir, shard_path(shard_dir, "index.json"))
+            for dest, page in index.pages.items():
+                self.index.pages[os.path.join(self.public, os.path.relpath(dest, shard_dir))] = page
+        if self.search is not None:
+            search = SearchIndex(shard_dir, shard_path(shard_dir, "search.pickle"))
+            for dest, page in search.pages.items():
+                self.search.add(os.path.join(self.public, os.path.relpath(dest, shard_dir)), *page)
+        if self.links is not None:
+            links = LinkIndex(shard_dir, shard_path(shard_dir, "links.pickle"))
+            for dest, page in links.pages.items():
+                self.links.pages[os.path.join(self.public, os.path.relpath(dest, shard_dir))] = page
+        graph = DependencyGraph(shard_path(shard_dir, "deps.pickle"))
+        for node, deps in graph.edges.items():
+            if relative_to(node, shard_dir) is not None:
+                node = os.path.join(self.public, os.path.relpath(node, shard_dir))
+            self.graph.add(node, deps)
+
+    def finish(self):
+        artifacts = []
+        if self.index is not None:
+            if self.shard is None:
+                with instrument.timer("site_index"):
+                    artifacts = write_artifacts(self.index, page_template(self.template, self.context.asset_urls), self.writer, self.base_url)
+            self.index.save()
+        if self.search is not None:
+            if self.shard is None:
+                with instrument.timer("search_index"):
+                    artifacts.extend(self.search.write(self.writer))
+            self.search.save()
+        if self.links is not None:
+            if self.shard is None:
+                self.check_links(artifacts)
+            self.links.save()
+        print(self.writer.wait().summary())
+        if self.compressor is not None:
+            for path in artifacts:
+                self.compressor.ensure(path)
+            with instrument.timer("compress"):
+                print(self.compressor.wait().summary())
+        if self.assets is not None and self.shard is None:
+            self.assets.save(self.public)
+        if self.shard is not None:
+            self.shard.save(self.public, [entry["source"] for entry in self.manifest.entries.values()])
+        self.manifest.save()
+        self.graph.save()
+        for cache in (self.cache, self.highlights):
+            cache.save()
+            print(cache.summary())
+            cache.delta()
+
+    def check_links(self, artifacts):
+        with instrument.timer("check_links"):
+            urls = [page_url(self.public, path) for path in artifacts]
+            if self.assets is not None:
+                urls.extend(self.assets.urls)
+            report = self.links.check(self.manifest.entries, urls)
+        for item in report.broken:
+            print(f"Broken {item['kind']} in {item['source']}: {item['url']}")
+        report.save(self.link_report_path)
+        print(report.summary())
+
+    def remove_outputs_of(self, source):
+        for dest in [dest for dest, entry in self.manifest.entries.items() if entry["source"] == source]:
+            print(f"Remove stale output {dest}")
+            self.manifest.remove(dest)
+            self.graph.remove(dest)
+            if self.index is not None:
+                self.index.remove(dest)
+            if self.search is not None:
+                self.search.remove(dest)
+            if self.links is not None:
+                self.links.remove(dest)
+
+    def rebuild(self, paths):
+        if self.shard is not None:
+            raise ShardError("shards are built with full builds only")
+        self.manifest.reset()
+
+        changed = list(paths)
+        pages = []
+        stats = SyncStats()
+        refingerprint = False
+        for path in paths:
+            rel_path = relative_to(path, self.content)
+            if rel_path is not None:
+                if os.path.isfile(path):
+                    pages.append((path, page_dest_path(self.public, rel_path)))
+                else:
+                    self.remove_outputs_of(path)
+                continue
+
+            rel_path = relative_to(path, self.static)
+            if rel_path is not None:
+                if self.assets is not None:
+                    # outputs carry the old fingerprint, copy_static() writes the new ones
+                    self.remove_outputs_of(path)
+                    refingerprint = True
+                elif not os.path.isfile(path):
+                    self.remove_outputs_of(path)
+                else:
+                    dest_path = os.path.join(self.public, rel_path)
+                    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                    copy_file(path, dest_path, self.manifest, stats, self.checksum, self.link, self.compressor)
+
+        if self.assets is not None and refingerprint:
+            previous = self.assets.hashes()
+            self.assets.reset()
+            self.copy_static()
+            changed.extend(self.assets.changed(previous))
+
+        causes = self.graph.affected(changed)
+        queued = {dest_path for _, dest_path in pages}
+        for dest_path in causes:
+            entry = self.manifest.entries.get(dest_path)
+            if entry is not None and dest_path not in queued and os.path.isfile(entry["source"]):
+                pages.append((entry["source"], dest_path))
+
+        generate_pages(pages, self.template, self.context, causes)
+        if stats.copied or stats.skipped:
+            print(stats.summary())
+        self.finish()
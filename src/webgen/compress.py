@@ -0,0 +1,90 @@
+import gzip
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".mjs", ".json", ".svg", ".xml", ".txt", ".md")
+MIN_SIZE = 256
+
+def is_compressible(path):
+    return path.endswith(COMPRESSIBLE_EXTENSIONS)
+
+def gzip_path(path):
+    return path + ".gz"
+
+def remove_gzip(path):
+    if os.path.exists(gzip_path(path)):
+        os.remove(gzip_path(path))
+
+class CompressStats:
+    def __init__(self):
+        self.compressed = 0
+        self.unchanged = 0
+        self.not_smaller = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def summary(self):
+        return (
+            f"Gzip: {self.compressed} compressed ({self.bytes_in} -> {self.bytes_out} bytes), "
+            f"{self.unchanged} unchanged, {self.not_smaller} not worth compressing"
+        )
+
+class Compressor:
+    def __init__(self, workers=None, level=9):
+        self.level = level
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.futures = []
+        self.lock = threading.Lock()
+        self.stats = CompressStats()
+
+    def submit(self, path):
+        if is_compressible(path):
+            self.futures.append(self.executor.submit(self.compress, path))
+
+    def ensure(self, path):
+        if not is_compressible(path):
+            return
+        try:
+            fresh = os.stat(gzip_path(path)).st_mtime_ns >= os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            fresh = False
+        if fresh:
+            with self.lock:
+                self.stats.unchanged += 1
+        else:
+            self.submit(path)
+
+    def compress(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < MIN_SIZE:
+            compressed = None
+        else:
+            compressed = gzip.compress(data, self.level, mtime=0)
+
+        if compressed is None or len(compressed) >= len(data):
+            remove_gzip(path)
+            with self.lock:
+                self.stats.not_smaller += 1
+            return
+
+        tmp_path = gzip_path(path) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, gzip_path(path))
+        with self.lock:
+            self.stats.compressed += 1
+            self.stats.bytes_in += len(data)
+            self.stats.bytes_out += len(compressed)
+
+    def wait(self):
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
+        stats, self.stats = self.stats, CompressStats()
+        return stats
+
+    def close(self):
+        self.wait()
+        self.executor.shutdown()
@@ -0,0 +1,59 @@
+import contextlib
+import io
+import json
+import os
+import socketserver
+import threading
+import time
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.dispatch(json.loads(line))
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+class BuildServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    # editor tooling may connect many clients at once; the build lock serializes them
+    request_queue_size = 64
+
+    def __init__(self, socket_path, site):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        base_dir = os.path.dirname(socket_path)
+        if base_dir != "" and not os.path.exists(base_dir):
+            os.makedirs(base_dir)
+        super().__init__(socket_path, DaemonHandler)
+        self.socket_path = socket_path
+        self.site = site
+        self.lock = threading.Lock()
+
+    def dispatch(self, request):
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True}
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown).start()
+            return {"ok": True}
+        if command not in ("build", "rebuild"):
+            return {"ok": False, "error": f"unknown command {command!r}"}
+
+        with self.lock:
+            start = time.perf_counter()
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                if command == "build":
+                    self.site.build(full=request.get("full", False))
+                else:
+                    self.site.rebuild(request.get("paths", []))
+            elapsed = time.perf_counter() - start
+        return {"ok": True, "elapsed": elapsed, "output": output.getvalue()}
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
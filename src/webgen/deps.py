@@ -0,0 +1,77 @@
+import os
+
+from persist import load_versioned, save_versioned
+
+DEPS_PATH = ".build/deps.pickle"
+DEPS_VERSION = 1
+
+class DependencyGraph:
+    def __init__(self, path=None):
+        self.path = path
+        self.edges = {}
+        # pages sharing a dependency tuple are stored, queried and persisted together
+        self.groups = {}
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def add(self, node, deps):
+        deps = tuple(os.path.normpath(dep) for dep in deps)
+        if self.edges.get(node) == deps:
+            return
+        self.remove(node)
+        self.edges[node] = deps
+        group = self.groups.get(deps)
+        if group is None:
+            group = self.groups[deps] = set()
+        group.add(node)
+
+    def remove(self, node):
+        deps = self.edges.pop(node, None)
+        if deps is not None:
+            group = self.groups[deps]
+            group.discard(node)
+            if not group:
+                del self.groups[deps]
+
+    def prune(self, outputs):
+        needed = {dep for deps in self.groups for dep in deps}
+        for node in [node for node in self.edges if node not in outputs and node not in needed]:
+            self.remove(node)
+
+    def affected(self, changed):
+        causes = {os.path.normpath(path): None for path in changed}
+        frontier = set(causes)
+        pending = dict(self.groups)
+        while frontier:
+            found = {}
+            for deps in [deps for deps in pending if not frontier.isdisjoint(deps)]:
+                dep = next(dep for dep in deps if dep in frontier)
+                found.update(dict.fromkeys(pending.pop(deps), dep))
+            for node in causes.keys() & found.keys():
+                del found[node]
+            causes.update(found)
+            frontier = set(found)
+        return causes
+
+    def staleness(self, node, causes):
+        if node not in self.edges:
+            return "no recorded dependencies"
+        dep = causes.get(node)
+        if dep is None:
+            return None
+        chain = []
+        while causes.get(dep) is not None:
+            chain.append(dep)
+            dep = causes[dep]
+        return f"{dep} changed" + "".join(f" (via {via})" for via in chain)
+
+    def load(self):
+        groups = load_versioned(self.path, DEPS_VERSION)
+        if groups is not None:
+            self.groups = dict(groups)
+            self.edges = {node: deps for deps, nodes in groups for node in nodes}
+
+    def save(self):
+        if self.path is None:
+            return
+        save_versioned(self.path, DEPS_VERSION, list(self.groups.items()))
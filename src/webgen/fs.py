@@ -1,7 +1,76 @@
 import os
 import shutil
 
-def copy_src_dir_to_dest_dir(src, dest, path=""):
+from webgen.manifest import file_hash
+
+LINK_MODES = ("copy", "hardlink", "reflink")
+FICLONE = 0x40049409
+
+class SyncStats:
+    def __init__(self):
+        self.copied = 0
+        self.skipped = 0
+        self.bytes_copied = 0
+        self.bytes_skipped = 0
+
+    def summary(self):
+        return (
+            f"Static files: {self.copied} copied ({self.bytes_copied} bytes), "
+            f"{self.skipped} unchanged ({self.bytes_skipped} bytes)"
+        )
+
+def is_same_file(src_file, src_stat, dest_file, checksum=False):
+    try:
+        dest_stat = os.stat(dest_file)
+    except FileNotFoundError:
+        return False
+
+    if (dest_stat.st_dev, dest_stat.st_ino) == (src_stat.st_dev, src_stat.st_ino):
+        return True
+    if dest_stat.st_size != src_stat.st_size:
+        return False
+    if checksum:
+        return file_hash(src_file) == file_hash(dest_file)
+    return dest_stat.st_mtime_ns == src_stat.st_mtime_ns
+
+def clone_file(src_file, dest_file):
+    import fcntl
+
+    with open(src_file, "rb") as src, open(dest_file, "wb") as dest:
+        try:
+            fcntl.ioctl(dest.fileno(), FICLONE, src.fileno())
+            return
+        except OSError:
+            pass
+
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dest.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+
+def copy_data(src_file, dest_file, link="copy"):
+    if os.path.lexists(dest_file):
+        os.remove(dest_file)
+
+    if link == "hardlink":
+        try:
+            os.link(src_file, dest_file)
+            return
+        except OSError:
+            pass
+    elif link == "reflink":
+        try:
+            clone_file(src_file, dest_file)
+            shutil.copystat(src_file, dest_file)
+            return
+        except (ImportError, AttributeError, OSError):
+            pass
+
+    shutil.copy2(src_file, dest_file)
+
+def copy_src_dir_to_dest_dir(src, dest, path="", manifest=None, stats=None, checksum=False, link="copy", compressor=None, assets=None):
     dest_dir = os.path.join(dest, path)
     if not os.path.exists(dest_dir):
         os.mkdir(dest_dir)
@@ -9,12 +78,40 @@ def copy_src_dir_to_dest_dir(src, dest, path=""):
     with os.scandir(os.path.join(src, path)) as it:
         for entry in it:
             if entry.is_dir():
-                copy_src_dir_to_dest_dir(src, dest, os.path.join(path, entry.name))
+                copy_src_dir_to_dest_dir(src, dest, os.path.join(path, entry.name), manifest, stats, checksum, link, compressor, assets)
             elif entry.is_file():
-                shutil.copy(os.path.join(src, path, entry.name), dest_dir)
+                src_file = os.path.join(src, path, entry.name)
+                rel_path = os.path.join(path, entry.name)
+                if assets is not None:
+                    rel_path = assets.fingerprint(src_file, rel_path)
+                copy_file(src_file, os.path.join(dest, rel_path), manifest, stats, checksum, link, compressor)
 
-def copy_files(src, dest):
-    if os.path.exists(dest):
+def copy_file(src_file, dest_file, manifest=None, stats=None, checksum=False, link="copy", compressor=None):
+    src_stat = os.stat(src_file)
+    if manifest is not None and is_same_file(src_file, src_stat, dest_file, checksum):
+        manifest.track(src_file, dest_file)
+        if compressor is not None:
+            compressor.ensure(dest_file)
+        if stats is not None:
+            stats.skipped += 1
+            stats.bytes_skipped += src_stat.st_size
+        return
+
+    copy_data(src_file, dest_file, link)
+    if compressor is not None:
+        compressor.submit(dest_file)
+    if manifest is not None:
+        manifest.track(src_file, dest_file)
+    if stats is not None:
+        stats.copied += 1
+        stats.bytes_copied += src_stat.st_size
+
+def copy_files(src, dest, manifest=None, checksum=False, link="copy", compressor=None, assets=None):
+    if os.path.exists(dest) and (manifest is None or not manifest.entries):
         shutil.rmtree(dest)
-    copy_src_dir_to_dest_dir(src, dest)
-            
+    if not os.path.exists(dest):
+        os.makedirs(dest)
+
+    stats = SyncStats()
+    copy_src_dir_to_dest_dir(src, dest, manifest=manifest, stats=stats, checksum=checksum, link=link, compressor=compressor, assets=assets)
+    return stats
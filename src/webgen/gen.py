@@ -1,43 +1,299 @@
+import hashlib
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import urljoin
 
-from data.highlevel import markdown_to_html_node
+import instrument
+from data.blocks import scan_blocks
+from data.highlevel import UrlRewriter, markdown_to_html_node, render_block_html, render_blocks
+from data.htmlnode import escape_text
+from webgen.manifest import file_hash
+from webgen.siteindex import PageSummary, page_url
+from webgen.template import load_template
+from webgen.writer import OutputWriter
 
 
-def extract_title(text):
-    for line in text.splitlines():
-        if line.lstrip().startswith("# "):
-            return line.lstrip()[2:].strip()
-    raise Exception("no header found")
+STREAM_THRESHOLD = 8 << 20
 
-def generate_page(from_path, template_path, dest_path):
-    print(f"Generate page from {from_path} to {dest_path} using {template_path}")
+def render_page(from_path, template, cache=None, summary=None, highlights=None, rewrite=None):
+    with open(from_path) as f:
+        md_file = f.read()
+
+    if summary is None:
+        summary = PageSummary()
+    node = markdown_to_html_node(md_file, cache, summary, highlights, rewrite)
+    with instrument.timer("to_html"):
+        html = node.to_html()
+    title = summary.require_title()
+
+    with instrument.timer("template"):
+        return template.render({"Title": escape_text(title), "Content": html})
+
+def write_page(dest_path, html_content, writer=None):
+    with instrument.timer("write", path=dest_path):
+        (writer or OutputWriter()).write(dest_path, html_content)
+
+def stream_page(from_path, template, dest_path, cache=None, writer=None, summary=None, highlights=None, rewrite=None):
     with open(from_path) as f:
         md_file = f.read()
 
-    with open(template_path) as f:
-        template_file = f.read()
-    
-    html = markdown_to_html_node(md_file).to_html()
-    title = extract_title(md_file)
+    if summary is None:
+        summary = PageSummary()
+    node = markdown_to_html_node(md_file, cache, summary, highlights, rewrite)
+    title = summary.require_title()
+
+    # streamed on the calling thread even with a background writer, the page never exists as one string
+    with instrument.timer("to_html+write", path=dest_path):
+        with (writer or OutputWriter()).open(dest_path) as f:
+            template.write(f, {"Title": escape_text(title), "Content": node.iter_html()})
+
+def read_lines(f):
+    for line in f:
+        yield line.rstrip("\n")
+
+def stream_large_page(from_path, template, dest_path, cache=None, writer=None, summary=None, highlights=None, rewrite=None):
+    if summary is None:
+        summary = PageSummary()
+    with open(from_path) as src:
+        blocks = summary.scan(scan_blocks(read_lines(src)))
+        rendered = render_blocks(blocks, cache, highlights, rewrite)
 
-    html_content = template_file.replace("{{ Title }}", title).replace("{{ Content }}", html)
+        pending = []
+        for block_type, lines in blocks:
+            pending.append(render_block_html(block_type, lines, cache, highlights, rewrite))
+            if summary.title is not None:
+                break
+        title = summary.require_title()
 
-    base_dir = os.path.dirname(dest_path)
-    if not os.path.exists(base_dir):
-        os.makedirs(base_dir)
-    
-    with open(dest_path, "w") as f:
-        f.write(html_content)
+        def content():
+            yield "<div>"
+            yield from pending
+            pending.clear()
+            yield from rendered
+            yield "</div>"
 
-def generate_pages_recursively(dir_path_content, template_path, dest_dir_path, path=""):
-    dest_dir = os.path.join(dest_dir_path, path)
-    if not os.path.exists(dest_dir):
-        os.mkdir(dest_dir)
+        with instrument.timer("to_html+write", path=dest_path):
+            with (writer or OutputWriter()).open(dest_path) as f:
+                template.write(f, {"Title": escape_text(title), "Content": content()})
 
+def page_template(template_path, asset_urls=None):
+    template = load_template(template_path)
+    if asset_urls:
+        # one template serves pages at every depth, so only absolute references are rewritten
+        template = template.rewrite_urls(lambda url: asset_urls.get(url, url))
+    return template
+
+class BuildContext:
+    # per-build state handed down from Site to generate_pages and generate_page
+    def __init__(self, *, public=None, manifest=None, workers=1, cache=None, highlights=None, writer=None, compressor=None,
+                 assets=None, index=None, search=None, graph=None, links=None, explain=False):
+        self.public = public
+        self.manifest = manifest
+        self.workers = workers
+        self.cache = cache
+        self.highlights = highlights
+        self.writer = writer or OutputWriter(digests=None if manifest is None else manifest.outputs)
+        self.compressor = compressor
+        self.assets = assets
+        self.index = index
+        self.search = search
+        self.graph = graph
+        self.links = links
+        self.explain = explain
+
+    @property
+    def terms(self):
+        return self.search is not None
+
+    @property
+    def urls(self):
+        return self.links is not None or (self.graph is not None and self.assets is not None)
+
+    @property
+    def asset_urls(self):
+        return None if self.assets is None else self.assets.urls
+
+    def base_url(self, dest_path):
+        return "/" if self.public is None else page_url(self.public, dest_path)
+
+    def rewriter(self, dest_path):
+        if self.assets is None:
+            return None
+        return UrlRewriter(self.assets.urls, self.base_url(dest_path))
+
+    def summary(self):
+        return PageSummary(self.terms, self.urls)
+
+def generate_page(from_path, template_path, dest_path, context=None, template=None):
+    print(f"Generate page from {from_path} to {dest_path} using {template_path}")
+    if context is None:
+        context = BuildContext()
+    if template is None:
+        template = page_template(template_path, context.asset_urls)
+    summary = context.summary()
+    rewrite = context.rewriter(dest_path)
+    with instrument.timer("page", path=from_path):
+        if os.path.getsize(from_path) >= STREAM_THRESHOLD:
+            stream_large_page(from_path, template, dest_path, context.cache, context.writer, summary, context.highlights, rewrite)
+        else:
+            stream_page(from_path, template, dest_path, context.cache, context.writer, summary, context.highlights, rewrite)
+    return summary
+
+def collect_pages(dir_path_content, dest_dir_path, path=""):
+    pages = []
     with os.scandir(os.path.join(dir_path_content, path)) as it:
         for entry in it:
             if entry.is_dir():
-                generate_pages_recursively(dir_path_content, template_path, dest_dir_path, os.path.join(path, entry.name))
+                pages.extend(collect_pages(dir_path_content, dest_dir_path, os.path.join(path, entry.name)))
             elif entry.is_file():
-                new_file = entry.name.rsplit(".", maxsplit=1)[0] + ".html"
-                generate_page(os.path.join(dir_path_content, path, entry.name), template_path, os.path.join(dest_dir, new_file))
\ No newline at end of file
+                pages.append((
+                    os.path.join(dir_path_content, path, entry.name),
+                    page_dest_path(dest_dir_path, os.path.join(path, entry.name)),
+                ))
+    return pages
+
+def page_dest_path(dest_dir_path, rel_path):
+    return os.path.join(dest_dir_path, rel_path.rsplit(".", maxsplit=1)[0] + ".html")
+
+worker_cache = None
+worker_highlights = None
+worker_asset_urls = None
+
+def init_worker(cache, trace=None, asset_urls=None, highlights=None):
+    global worker_cache, worker_highlights, worker_asset_urls
+    worker_cache = cache
+    worker_highlights = highlights
+    worker_asset_urls = asset_urls
+    for shared in (cache, highlights):
+        if shared is not None:
+            shared.record_added = True
+            shared.delta()
+    if trace is not None:
+        instrument.enable(trace)
+
+def render_page_in_worker(from_path, template, terms=False, urls=False, base_url="/"):
+    summary = PageSummary(terms, urls)
+    rewrite = None if worker_asset_urls is None else UrlRewriter(worker_asset_urls, base_url)
+    with instrument.timer("page", path=from_path):
+        html = render_page(from_path, template, worker_cache, summary, worker_highlights, rewrite)
+    profile = instrument.recorder.drain() if instrument.enabled() else None
+    delta = None if worker_cache is None else worker_cache.delta()
+    highlight_delta = None if worker_highlights is None else worker_highlights.delta()
+    return html, summary, delta, highlight_delta, profile
+
+def generate_pages_parallel(pages, template_path, context):
+    template = page_template(template_path, context.asset_urls)
+    large = {(from_path, dest_path) for from_path, dest_path in pages if os.path.getsize(from_path) >= STREAM_THRESHOLD}
+    trace = instrument.recorder.trace if instrument.enabled() else None
+    cache, highlights = context.cache, context.highlights
+    with ProcessPoolExecutor(max_workers=context.workers, initializer=init_worker, initargs=(cache, trace, context.asset_urls, highlights)) as executor:
+        futures = {
+            executor.submit(
+                render_page_in_worker, from_path, template, context.terms, context.urls, context.base_url(dest_path)
+            ): (from_path, dest_path)
+            for from_path, dest_path in pages
+            if (from_path, dest_path) not in large
+        }
+        for from_path, dest_path in large:
+            summary = generate_page(from_path, template_path, dest_path, context, template)
+            yield from_path, dest_path, summary
+
+        for future in as_completed(futures):
+            from_path, dest_path = futures[future]
+            print(f"Generate page from {from_path} to {dest_path} using {template_path}")
+            html, summary, delta, highlight_delta, profile = future.result()
+            if cache is not None:
+                cache.merge(delta)
+            if highlight_delta is not None:
+                highlights.merge(highlight_delta)
+            if profile is not None:
+                instrument.recorder.merge(profile)
+            write_page(dest_path, html, context.writer)
+            yield from_path, dest_path, summary
+
+def generate_pages_serial(pages, template_path, context):
+    template = page_template(template_path, context.asset_urls)
+    for from_path, dest_path in pages:
+        summary = generate_page(from_path, template_path, dest_path, context, template)
+        yield from_path, dest_path, summary
+
+def generate_pages_recursively(dir_path_content, template_path, dest_dir_path, context=None, shard=None, causes=None):
+    if not os.path.exists(dest_dir_path):
+        os.makedirs(dest_dir_path)
+
+    pages = collect_pages(dir_path_content, dest_dir_path)
+    if shard is not None:
+        pages = shard.select(pages)
+    generate_pages(pages, template_path, context, causes)
+
+def use_assets(assets, cache=None):
+    salt = "" if assets is None else assets.digest()
+    if cache is not None:
+        cache.salt = salt
+    return salt
+
+def asset_dependencies(urls, assets, base_url="/"):
+    if assets is None:
+        return []
+    targets = {urljoin(base_url, url) for url in urls}
+    return sorted({assets.source_of(url) for url in targets if url in assets.urls})
+
+def page_staleness(from_path, dest_path, context, template_hash, causes):
+    reason = context.manifest.staleness(from_path, dest_path, template_hash)
+    if reason is None and context.graph is not None:
+        reason = context.graph.staleness(dest_path, causes)
+    if reason is None and context.index is not None and dest_path not in context.index.pages:
+        reason = "not in the site index"
+    if reason is None and context.search is not None and dest_path not in context.search.pages:
+        reason = "not in the search index"
+    if reason is None and context.links is not None and dest_path not in context.links.pages:
+        reason = "not in the link index"
+    return reason
+
+def generate_pages(pages, template_path, context=None, causes=None):
+    if context is None:
+        context = BuildContext()
+    manifest, assets, graph, compressor = context.manifest, context.assets, context.graph, context.compressor
+
+    salt = use_assets(assets, context.cache)
+    if graph is not None:
+        graph.add(template_path, asset_dependencies(load_template(template_path).urls(), assets))
+    template_hash = None
+    if manifest is not None:
+        template_hash = file_hash(template_path)
+        if assets is not None:
+            # with a graph, asset edits only invalidate the pages referencing them
+            marker = "fingerprint" if graph is not None else salt
+            template_hash = hashlib.sha256((template_hash + marker).encode()).hexdigest()
+        stale = []
+        for from_path, dest_path in pages:
+            reason = page_staleness(from_path, dest_path, context, template_hash, causes or {})
+            if reason is not None:
+                if context.explain:
+                    print(f"Rebuild {dest_path}: {reason}")
+                stale.append((from_path, dest_path))
+            elif compressor is not None:
+                compressor.ensure(dest_path)
+        pages = stale
+
+    if context.workers == 1 or len(pages) <= 1:
+        generated = generate_pages_serial(pages, template_path, context)
+    else:
+        generated = generate_pages_parallel(pages, template_path, context)
+
+    for from_path, dest_path, summary in generated:
+        if manifest is not None:
+            manifest.record(from_path, dest_path, template_hash)
+        if context.index is not None:
+            context.index.add(from_path, dest_path, summary)
+        if context.search is not None:
+            context.search.add(dest_path, page_url(context.search.public, dest_path), summary.title, summary.terms)
+        if graph is not None:
+            graph.add(dest_path, [template_path, *asset_dependencies(summary.links | summary.images, assets, context.base_url(dest_path))])
+        if context.links is not None:
+            context.links.add(from_path, dest_path, summary)
+
+    context.writer.flush()
+    if compressor is not None:
+        for _, dest_path in pages:
+            compressor.ensure(dest_path)
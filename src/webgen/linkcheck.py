@@ -0,0 +1,94 @@
+import json
+import os
+import re
+from urllib.parse import unquote, urljoin
+
+from persist import load_versioned, save_versioned
+from webgen.siteindex import page_url
+
+LINKS_PATH = ".build/links.pickle"
+LINK_REPORT_PATH = ".build/link-report.json"
+LINKS_VERSION = 1
+SCHEME = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:")
+
+def link_target(base_url, url):
+    url = url.split("#", 1)[0].split("?", 1)[0]
+    if url == "" or url.startswith("//") or SCHEME.match(url):
+        return None
+    if not url.startswith("/"):
+        url = urljoin(base_url, url)
+    return unquote(url)
+
+def resolves(target, urls):
+    if target in urls:
+        return True
+    base = target.rstrip("/")
+    return base + "/index.html" in urls or base + ".html" in urls
+
+class LinkReport:
+    def __init__(self):
+        self.checked = 0
+        self.targets = 0
+        self.broken = []
+
+    def summary(self):
+        images = sum(1 for item in self.broken if item["kind"] == "image")
+        return (
+            f"Links: {self.checked} checked ({self.targets} distinct targets), "
+            f"{len(self.broken) - images} broken links, {images} missing images"
+        )
+
+    def save(self, path):
+        base_dir = os.path.dirname(path)
+        if base_dir != "" and not os.path.exists(base_dir):
+            os.makedirs(base_dir)
+        with open(path, "w") as f:
+            json.dump({"checked": self.checked, "broken": self.broken}, f, indent=1)
+
+class LinkIndex:
+    def __init__(self, public, path=None):
+        self.public = public
+        self.path = path
+        self.pages = {}
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def add(self, source, dest, summary):
+        self.pages[dest] = (source, tuple(sorted(summary.links)), tuple(sorted(summary.images)))
+
+    def remove(self, dest):
+        self.pages.pop(dest, None)
+
+    def prune(self, outputs):
+        self.pages = {dest: page for dest, page in self.pages.items() if dest in outputs}
+
+    def check(self, outputs, urls=()):
+        known = {page_url(self.public, dest) for dest in outputs}
+        known.update(urls)
+        report = LinkReport()
+        found = {}
+        for dest, (source, links, images) in sorted(self.pages.items()):
+            base_url = page_url(self.public, dest)
+            for kind, refs in (("link", links), ("image", images)):
+                for url in refs:
+                    target = link_target(base_url, url)
+                    if target is None:
+                        continue
+                    report.checked += 1
+                    exists = found.get(target)
+                    if exists is None:
+                        exists = found[target] = resolves(target, known)
+                    if not exists:
+                        report.broken.append({"page": base_url, "source": source, "kind": kind, "url": url, "target": target})
+        report.targets = len(found)
+        return report
+
+    def load(self):
+        pages = load_versioned(self.path, LINKS_VERSION)
+        if pages is not None:
+            self.pages = pages
+
+    def save(self):
+        if self.path is None:
+            return
+        save_versioned(self.path, LINKS_VERSION, self.pages)
@@ -0,0 +1,106 @@
+import hashlib
+import os
+
+from persist import load_json, save_json
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def remove_output(path):
+    for output in (path, path + ".gz"):
+        if os.path.exists(output):
+            os.remove(output)
+    try:
+        os.removedirs(os.path.dirname(path))
+    except OSError:
+        pass
+
+class Manifest:
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.outputs = {}
+        self.reset()
+        self.entries = load_json(path, {})
+        for dest, entry in self.entries.items():
+            output = entry.pop("output", None)
+            if output is not None:
+                self.outputs[dest] = output
+
+    def reset(self):
+        self.seen = set()
+        self.hashes = {}
+
+    def source_hash(self, source, dest):
+        st = os.stat(source)
+        entry = self.entries.get(dest)
+        if entry is not None and entry["source"] == source and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime_ns:
+            return entry["hash"], st
+        if source not in self.hashes:
+            self.hashes[source] = file_hash(source)
+        return self.hashes[source], st
+
+    def staleness(self, source, dest, template_hash=None):
+        self.seen.add(dest)
+        entry = self.entries.get(dest)
+        if entry is None:
+            return "not in the build manifest"
+        if not os.path.exists(dest):
+            return "output is missing"
+        digest, _ = self.source_hash(source, dest)
+        if entry["source"] != source or entry["hash"] != digest:
+            return f"{source} changed"
+        if entry.get("template") != template_hash:
+            return "template changed"
+        return None
+
+    def is_fresh(self, source, dest, template_hash=None):
+        return self.staleness(source, dest, template_hash) is None
+
+    def record(self, source, dest, template_hash=None):
+        self.seen.add(dest)
+        digest, st = self.source_hash(source, dest)
+        self.entries[dest] = {
+            "source": source,
+            "hash": digest,
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+            "template": template_hash,
+        }
+
+    def track(self, source, dest):
+        self.seen.add(dest)
+        st = os.stat(source)
+        self.entries[dest] = {
+            "source": source,
+            "hash": None,
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+            "template": None,
+        }
+
+    def adopt(self, dest, entry):
+        self.seen.add(dest)
+        self.entries[dest] = entry
+
+    def remove(self, dest):
+        remove_output(dest)
+        self.entries.pop(dest, None)
+        self.outputs.pop(dest, None)
+
+    def prune(self):
+        stale = [dest for dest in self.entries if dest not in self.seen]
+        for dest in stale:
+            self.remove(dest)
+        return stale
+
+    def save(self):
+        entries = {
+            dest: entry if dest not in self.outputs else dict(entry, output=self.outputs[dest])
+            for dest, entry in self.entries.items()
+        }
+        save_json(self.path, entries, indent=1, sort_keys=True)
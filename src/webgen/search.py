@@ -0,0 +1,131 @@
+import gzip
+import json
+import os
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from data.blocks import BlockType
+from data.highlevel import text_to_textnodes
+from persist import load_versioned, save_versioned
+
+SEARCH_PATH = ".build/search.pickle"
+SEARCH_DIR = "search"
+SEARCH_VERSION = 1
+SHARDS = 64
+TOKEN_REGEX = re.compile(r"\w+")
+
+def tokenize(text):
+    return TOKEN_REGEX.findall(text.lower())
+
+def block_text(block_type, lines):
+    match block_type:
+        case BlockType.HEADING:
+            return "\n".join(lines).split(" ", maxsplit=1)[1]
+        case BlockType.QUOTE:
+            return "\n".join(line[1:] for line in lines)
+        case BlockType.UNORDERED_LIST | BlockType.ORDERED_LIST:
+            return "\n".join(line.split(" ", maxsplit=1)[-1] for line in lines)
+        case _:
+            return "\n".join(lines)
+
+def block_tokens(block_type, lines, nodes=None):
+    if block_type == BlockType.CODE:
+        return tokenize("\n".join(lines)[3:-3])
+    if nodes is None:
+        text = block_text(block_type, lines)
+        # inline markup other than link targets never contains word characters
+        if "](" not in text:
+            return tokenize(text)
+        nodes = text_to_textnodes(text)
+    tokens = []
+    for node in nodes:
+        if node.text is not None:
+            tokens.extend(tokenize(node.text))
+    return tokens
+
+def shard_of(term, shards=SHARDS):
+    return zlib.crc32(term.encode()) % shards
+
+def encode_postings(postings):
+    encoded = []
+    last_id = 0
+    for page_id, count in postings:
+        encoded.append(page_id - last_id)
+        encoded.append(count)
+        last_id = page_id
+    return encoded
+
+def compress_shard(shard):
+    data = json.dumps({term: encode_postings(postings) for term, postings in sorted(shard.items())}, separators=(",", ":"))
+    return gzip.compress(data.encode(), 6, mtime=0)
+
+class SearchIndex:
+    def __init__(self, public, path=None, shards=SHARDS):
+        self.public = public
+        self.path = path
+        self.shards = shards
+        self.pages = {}
+        self.dirty = True
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def add(self, dest, url, title, terms):
+        self.pages[dest] = (url, title, terms)
+        self.dirty = True
+
+    def remove(self, dest):
+        if self.pages.pop(dest, None) is not None:
+            self.dirty = True
+
+    def prune(self, outputs):
+        count = len(self.pages)
+        self.pages = {dest: page for dest, page in self.pages.items() if dest in outputs}
+        self.dirty = self.dirty or len(self.pages) != count
+
+    def build(self):
+        documents = sorted(self.pages.values(), key=lambda page: page[0])
+        shards = [{} for _ in range(self.shards)]
+        shard_cache = {}
+        for page_id, (_, _, terms) in enumerate(documents):
+            for term, count in terms.items():
+                shard = shard_cache.get(term)
+                if shard is None:
+                    shard = shard_cache[term] = shards[shard_of(term, self.shards)]
+                postings = shard.get(term)
+                if postings is None:
+                    shard[term] = [(page_id, count)]
+                else:
+                    postings.append((page_id, count))
+        meta = {
+            "version": SEARCH_VERSION,
+            "shards": self.shards,
+            "hash": "crc32",
+            "pages": [[url, title] for url, title, _ in documents],
+        }
+        return meta, shards
+
+    def write(self, writer):
+        base_dir = os.path.join(self.public, SEARCH_DIR)
+        meta_path = os.path.join(base_dir, "meta.json")
+        if not self.dirty and os.path.exists(meta_path):
+            return [meta_path]
+
+        meta, shards = self.build()
+        writer.write(meta_path, json.dumps(meta, separators=(",", ":")))
+        with ThreadPoolExecutor() as executor:
+            for idx, data in enumerate(executor.map(compress_shard, shards)):
+                writer.write(os.path.join(base_dir, f"{idx:02x}.json.gz"), data)
+        self.dirty = False
+        return [meta_path]
+
+    def load(self):
+        pages = load_versioned(self.path, SEARCH_VERSION)
+        if pages is not None:
+            self.pages = pages
+            self.dirty = False
+
+    def save(self):
+        if self.path is None:
+            return
+        save_versioned(self.path, SEARCH_VERSION, self.pages)
@@ -0,0 +1,72 @@
+import functools
+import os
+import threading
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+RELOAD_PATH = "/__build__"
+RELOAD_SCRIPT = f"""<script>
+(function () {{
+    var current = null;
+    setInterval(function () {{
+        fetch("{RELOAD_PATH}").then(function (r) {{ return r.text(); }}).then(function (build) {{
+            if (current !== null && build !== current) {{ location.reload(); }}
+            current = build;
+        }}).catch(function () {{}});
+    }}, 300);
+}})();
+</script>
+"""
+
+class BuildCounter:
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def bump(self):
+        with self.lock:
+            self.value += 1
+
+def inject_reload(html):
+    idx = html.rfind(b"</body>")
+    if idx == -1:
+        return html + RELOAD_SCRIPT.encode()
+    return html[:idx] + RELOAD_SCRIPT.encode() + html[idx:]
+
+class ReloadHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, counter, **kwargs):
+        self.counter = counter
+        super().__init__(*args, **kwargs)
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            return self.send_bytes(str(self.counter.value).encode(), "text/plain")
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            with open(path, "rb") as f:
+                return self.send_bytes(inject_reload(f.read()), "text/html; charset=utf-8")
+        return super().do_GET()
+
+    def send_bytes(self, body, content_type):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(directory, port, counter):
+    handler = functools.partial(ReloadHandler, directory=directory, counter=counter)
+    server = ThreadingHTTPServer(("", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,79 @@
+import heapq
+import json
+import os
+
+SHARD_DIR = ".webgen-shard"
+SHARD_FILE = "shard.json"
+
+class ShardError(Exception):
+    pass
+
+def parse_shard(spec):
+    if spec.startswith("@"):
+        with open(spec[1:]) as f:
+            files = [line.strip() for line in f if line.strip() != ""]
+        return Shard(files=files, label=os.path.basename(spec[1:]))
+    try:
+        index, count = map(int, spec.split("/"))
+    except ValueError:
+        raise ValueError(f"invalid shard {spec!r}, expected INDEX/COUNT or @FILE")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"invalid shard {spec!r}, expected 1 <= INDEX <= COUNT")
+    return Shard(index, count)
+
+def shard_path(public, name):
+    return os.path.join(public, SHARD_DIR, name)
+
+def balance(pages, count):
+    sized = sorted(((os.path.getsize(from_path), from_path, dest_path) for from_path, dest_path in pages), key=lambda page: (-page[0], page[1]))
+    heap = [(0, idx) for idx in range(count)]
+    shards = [[] for _ in range(count)]
+    for size, from_path, dest_path in sized:
+        total, idx = heapq.heappop(heap)
+        shards[idx].append((from_path, dest_path))
+        heapq.heappush(heap, (total + size, idx))
+    return shards
+
+class Shard:
+    def __init__(self, index=None, count=None, files=None, label=None):
+        self.index = index
+        self.count = count
+        self.files = None if files is None else {os.path.normpath(path) for path in files}
+        self.label = label if label is not None else f"{index}-of-{count}"
+
+    def select(self, pages):
+        if self.files is not None:
+            return [(from_path, dest_path) for from_path, dest_path in pages if os.path.normpath(from_path) in self.files]
+        return balance(pages, self.count)[self.index - 1]
+
+    def save(self, public, sources):
+        os.makedirs(os.path.join(public, SHARD_DIR), exist_ok=True)
+        with open(shard_path(public, SHARD_FILE), "w") as f:
+            json.dump({"label": self.label, "sources": sorted(sources)}, f, indent=1)
+
+def load_shard(public):
+    path = shard_path(public, SHARD_FILE)
+    if not os.path.exists(path):
+        raise ShardError(f"{public} is not a shard output directory")
+    with open(path) as f:
+        return json.load(f)
+
+def check_coverage(pages, shard_sources):
+    owners = {}
+    for label, sources in shard_sources:
+        for source in sources:
+            owners.setdefault(os.path.normpath(source), []).append(label)
+    expected = {os.path.normpath(from_path) for from_path, _ in pages}
+    missing = sorted(expected - owners.keys())
+    duplicated = sorted(source for source, labels in owners.items() if len(labels) > 1)
+    unknown = sorted(owners.keys() - expected)
+    problems = []
+    if missing:
+        problems.append(f"missing from every shard: {', '.join(missing)}")
+    if duplicated:
+        described = [f"{source} ({' and '.join(owners[source])})" for source in duplicated]
+        problems.append(f"built by several shards: {', '.join(described)}")
+    if unknown:
+        problems.append(f"no longer in content: {', '.join(unknown)}")
+    if problems:
+        raise ShardError("; ".join(problems))
@@ -0,0 +1,170 @@
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+
+from data.blocks import BlockType
+from data.highlevel import text_to_textnodes
+from data.textnode import TextType
+from persist import load_json, save_json
+from webgen.search import block_text, block_tokens
+
+INDEX_PATH = ".build/index.json"
+SITEMAP = "sitemap.xml"
+FEED = "feed.xml"
+SECTIONS = "sections.html"
+FEED_SIZE = 20
+INLINE_BLOCKS = (BlockType.PARAGRAPH, BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST)
+
+class PageSummary:
+    __slots__ = ("title", "headings", "words", "terms", "links", "images", "collect_urls")
+
+    def __init__(self, terms=False, urls=False):
+        self.title = None
+        self.headings = []
+        self.words = 0
+        self.terms = Counter() if terms else None
+        self.links = set()
+        self.images = set()
+        # link and image urls cost an inline parse per block, only done for the dependency graph and link check
+        self.collect_urls = urls
+
+    def add(self, block_type, lines):
+        self.words += sum(len(line.split()) for line in lines)
+        nodes = None
+        if self.collect_urls and block_type in INLINE_BLOCKS and any("](" in line for line in lines):
+            nodes = text_to_textnodes(block_text(block_type, lines))
+            for node in nodes:
+                if node.url is not None:
+                    (self.images if node.text_type == TextType.IMAGE else self.links).add(node.url)
+        if self.terms is not None:
+            self.terms.update(block_tokens(block_type, lines, nodes))
+        if self.title is None and block_type != BlockType.CODE:
+            # the first "# " line is the title even inside a paragraph or list, as in plain text
+            for line in lines:
+                line = line.lstrip()
+                if line.startswith("# "):
+                    self.title = line[2:].strip()
+                    break
+        if block_type == BlockType.HEADING:
+            head, text = lines[0].split(" ", maxsplit=1)
+            self.headings.append([len(head), text.strip()])
+
+    def scan(self, blocks):
+        for block_type, lines in blocks:
+            self.add(block_type, lines)
+            yield block_type, lines
+
+    def require_title(self):
+        if self.title is None:
+            raise Exception("no header found")
+        return self.title
+
+def page_url(public, dest_path):
+    return "/" + os.path.relpath(dest_path, public).replace(os.sep, "/")
+
+def section_of(url):
+    parts = url.strip("/").split("/")
+    return parts[0] if len(parts) > 1 else ""
+
+def attr(text):
+    return escape(text, {'"': "&quot;"})
+
+def iso_time(mtime):
+    return datetime.fromtimestamp(mtime / 1e9, timezone.utc).isoformat(timespec="seconds")
+
+class SiteIndex:
+    def __init__(self, public, path=None):
+        self.public = public
+        self.path = path
+        self.pages = {}
+        if path is not None:
+            self.pages = load_json(path, {})
+
+    def add(self, source, dest, summary):
+        self.pages[dest] = {
+            "source": source,
+            "url": page_url(self.public, dest),
+            "title": summary.title,
+            "headings": summary.headings,
+            "words": summary.words,
+            "mtime": os.stat(source).st_mtime_ns,
+        }
+
+    def remove(self, dest):
+        self.pages.pop(dest, None)
+
+    def prune(self, outputs):
+        self.pages = {dest: page for dest, page in self.pages.items() if dest in outputs}
+
+    def sorted_pages(self):
+        return sorted(self.pages.values(), key=lambda page: page["url"])
+
+    def sections(self):
+        sections = {}
+        for page in self.sorted_pages():
+            sections.setdefault(section_of(page["url"]), []).append(page)
+        return sections
+
+    def recent(self, count=FEED_SIZE):
+        return sorted(self.pages.values(), key=lambda page: (-page["mtime"], page["url"]))[:count]
+
+    def save(self):
+        if self.path is None:
+            return
+        save_json(self.path, self.pages, separators=(",", ":"), sort_keys=True)
+
+def render_sitemap(index, base_url=""):
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for page in index.sorted_pages():
+        lines.append(
+            f"<url><loc>{escape(base_url + page['url'])}</loc>"
+            f"<lastmod>{iso_time(page['mtime'])}</lastmod></url>"
+        )
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+def render_feed(index, base_url="", title="Recent pages"):
+    recent = index.recent()
+    updated = iso_time(recent[0]["mtime"]) if recent else iso_time(0)
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<feed xmlns="http://www.w3.org/2005/Atom">',
+        f"<title>{escape(title)}</title>",
+        f'<link href="{attr(base_url)}/"/>',
+        f"<id>{escape(base_url)}/</id>",
+        f"<updated>{updated}</updated>",
+    ]
+    for page in recent:
+        url = base_url + page["url"]
+        lines.append(
+            f"<entry><title>{escape(page['title'] or page['url'])}</title>"
+            f'<link href="{attr(url)}"/><id>{escape(url)}</id>'
+            f"<updated>{iso_time(page['mtime'])}</updated></entry>"
+        )
+    lines.append("</feed>")
+    return "\n".join(lines) + "\n"
+
+def render_sections(index):
+    parts = []
+    for section, pages in sorted(index.sections().items()):
+        parts.append(f"<h2>{escape(section or 'Home')}</h2><ul>")
+        for page in pages:
+            parts.append(f'<li><a href="{attr(page["url"])}">{escape(page["title"] or page["url"])}</a> ({page["words"]} words)</li>')
+        parts.append("</ul>")
+    return "<div>" + "".join(parts) + "</div>"
+
+def write_artifacts(index, template, writer, base_url=""):
+    artifacts = {
+        SITEMAP: render_sitemap(index, base_url),
+        FEED: render_feed(index, base_url),
+        SECTIONS: template.render({"Title": "Sections", "Content": render_sections(index)}),
+    }
+    paths = []
+    for name, text in artifacts.items():
+        paths.append(os.path.join(index.public, name))
+        writer.write(paths[-1], text)
+    return paths
@@ -0,0 +1,67 @@
+import os
+import re
+
+PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+URL_ATTRIBUTE = re.compile(r'((?:href|src)=")([^"]*)(")')
+
+class Template:
+    def __init__(self, text):
+        self.segments = []
+        self.slots = []
+        self.raw = []
+        start = 0
+        for match in PLACEHOLDER.finditer(text):
+            self.segments.append(text[start:match.start()])
+            self.slots.append(match.group(1))
+            self.raw.append(match.group(0))
+            start = match.end()
+        self.segments.append(text[start:])
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            return cls(f.read())
+
+    def render(self, values):
+        parts = [self.segments[0]]
+        for name, raw, segment in zip(self.slots, self.raw, self.segments[1:]):
+            parts.append(values.get(name, raw))
+            parts.append(segment)
+        return "".join(parts)
+
+    def write(self, f, values):
+        f.write(self.segments[0])
+        for name, raw, segment in zip(self.slots, self.raw, self.segments[1:]):
+            value = values.get(name, raw)
+            if isinstance(value, str):
+                f.write(value)
+            else:
+                f.writelines(value)
+            f.write(segment)
+
+    def rewrite_urls(self, rewrite):
+        template = Template("")
+        template.segments = [
+            URL_ATTRIBUTE.sub(lambda m: m.group(1) + rewrite(m.group(2)) + m.group(3), segment)
+            for segment in self.segments
+        ]
+        template.slots = self.slots
+        template.raw = self.raw
+        return template
+
+    def urls(self):
+        return [match.group(2) for segment in self.segments for match in URL_ATTRIBUTE.finditer(segment)]
+
+    def __eq__(self, rhs):
+        return self.segments == rhs.segments and self.slots == rhs.slots
+
+loaded_templates = {}
+
+def load_template(path):
+    st = os.stat(path)
+    stamp = st.st_mtime_ns, st.st_size
+    cached = loaded_templates.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = stamp, Template.from_file(path)
+        loaded_templates[path] = cached
+    return cached[1]
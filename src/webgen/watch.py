@@ -0,0 +1,49 @@
+import os
+import time
+
+def snapshot(paths):
+    files = {}
+    for path in paths:
+        if os.path.isfile(path):
+            st = os.stat(path)
+            files[path] = (st.st_mtime_ns, st.st_size)
+            continue
+        for dirpath, _, filenames in os.walk(path):
+            for name in filenames:
+                file_path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                files[file_path] = (st.st_mtime_ns, st.st_size)
+    return files
+
+def diff_snapshots(old, new):
+    changed = {path for path, stamp in new.items() if old.get(path) != stamp}
+    changed.update(path for path in old if path not in new)
+    return changed
+
+def wait_for_changes(paths, state, interval=0.1, debounce=0.2):
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths)
+        changed = diff_snapshots(state, current)
+        if changed:
+            break
+
+    quiet_since = time.monotonic()
+    while time.monotonic() - quiet_since < debounce:
+        time.sleep(interval)
+        latest = snapshot(paths)
+        more = diff_snapshots(current, latest)
+        if more:
+            changed |= more
+            quiet_since = time.monotonic()
+        current = latest
+    return changed, current
+
+def watch(paths, callback, interval=0.1, debounce=0.2):
+    state = snapshot(paths)
+    while True:
+        changed, state = wait_for_changes(paths, state, interval, debounce)
+        callback(sorted(changed))
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+import instrument
+from webgen.manifest import file_hash
+
+class WriteStats:
+    def __init__(self):
+        self.written = 0
+        self.unchanged = 0
+        self.bytes_written = 0
+
+    def summary(self):
+        return f"Output: {self.written} written ({self.bytes_written} bytes), {self.unchanged} unchanged"
+
+class HashingFile:
+    __slots__ = ("f", "digest", "size")
+
+    def __init__(self, f):
+        self.f = f
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, text):
+        data = text.encode()
+        self.digest.update(data)
+        self.size += len(data)
+        self.f.write(data)
+
+    def writelines(self, lines):
+        for text in lines:
+            self.write(text)
+
+def temp_path(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+class OutputWriter:
+    def __init__(self, background=False, max_pending=64, digests=None):
+        # path -> [mtime_ns, sha256] of earlier outputs, shared with Manifest.outputs by Site
+        self.digests = {} if digests is None else digests
+        self.lock = threading.Lock()
+        self.stats = WriteStats()
+        self.error = None
+        self.queue = None
+        self.thread = None
+        if background:
+            self.queue = queue.Queue(max_pending)
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    @property
+    def background(self):
+        return self.queue is not None
+
+    def make_dirs(self, path):
+        # not cached: pruning and full builds remove output directories behind the writer
+        base_dir = os.path.dirname(path)
+        if base_dir != "":
+            os.makedirs(base_dir, exist_ok=True)
+
+    def is_unchanged(self, path, size, digest):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if st.st_size != size:
+            return False
+        known = self.digests.get(path)
+        if known is None or known[0] != st.st_mtime_ns:
+            known = self.digests[path] = [st.st_mtime_ns, file_hash(path)]
+        return known[1] == digest
+
+    def write(self, path, text):
+        if self.queue is None:
+            self.write_now(path, text)
+        else:
+            self.queue.put((path, text))
+
+    def write_now(self, path, text):
+        data = text if isinstance(text, bytes) else text.encode()
+        self.make_dirs(path)
+        digest = hashlib.sha256(data).hexdigest()
+        if self.is_unchanged(path, len(data), digest):
+            self.done(path, None)
+            return
+        tmp_path = temp_path(path)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        self.done(path, tmp_path, len(data), digest)
+
+    @contextmanager
+    def open(self, path):
+        self.make_dirs(path)
+        tmp_path = temp_path(path)
+        try:
+            with open(tmp_path, "wb") as f:
+                out = HashingFile(f)
+                yield out
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        digest = out.digest.hexdigest()
+        if self.is_unchanged(path, out.size, digest):
+            os.remove(tmp_path)
+            self.done(path, None)
+        else:
+            self.done(path, tmp_path, out.size, digest)
+
+    def done(self, path, tmp_path, size=0, digest=None):
+        if tmp_path is not None:
+            os.replace(tmp_path, path)
+            self.digests[path] = [os.stat(path).st_mtime_ns, digest]
+        with self.lock:
+            if tmp_path is None:
+                self.stats.unchanged += 1
+            else:
+                self.stats.written += 1
+                self.stats.bytes_written += size
+                if instrument.enabled():
+                    instrument.count("bytes_written", size)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            try:
+                self.write_now(*item)
+            except Exception as e:
+                if self.error is None:
+                    self.error = e
+            self.queue.task_done()
+
+    def flush(self):
+        if self.queue is not None:
+            self.queue.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def wait(self):
+        self.flush()
+        with self.lock:
+            stats, self.stats = self.stats, WriteStats()
+        return stats
+
+    def close(self):
+        self.flush()
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.queue = None
+            self.thread = None